@@ -1,232 +1,2676 @@
-import copy
-import os
-
-import pygraphviz as pgv
-
-from abc import ABCMeta
-from abc import abstractmethod
-
-class SharedVarsInterface(metaclass=ABCMeta):
-    @abstractmethod
-    def clone(self):
-        pass
-
-    @abstractmethod
-    def equal(self, target):
-        pass
-
-    @abstractmethod
-    def to_str(self):
-        pass
-
-    @abstractmethod
-    def to_graph_str(self):
-        pass
-
-class Action(metaclass=ABCMeta):
-    @abstractmethod
-    def exec(self, process, dest, src):
-        pass
-
-class Guard(metaclass=ABCMeta):
-    @abstractmethod
-    def exec(self, process, state):
-        pass
-
-class GuardTrue(Guard):
-    def exec(self, process, state):
-        return True
-
-class ActionNop(Action):
-    def exec(self, process, dest, src):
-        pass
-
-class StateTransition:
-    def __init__(self, location, trans_list):
-        self.location = location
-        self.transitions = trans_list
-
-class Transition:
-    def __init__(self, label, location, guard, action):
-        self.label = label
-        self.location = location
-        self.guard = guard
-        self.action = action
-
-    def to_str(self):
-        return '{0} {1}'.format(self.label, self.location)
-
-class Process:
-    _dir_name = 'img'
-
-    def __init__(self, name, state_trans):
-        self.name = name
-        self.state_trans = state_trans
-
-    def next_trans(self, location):
-        for t in self.state_trans:
-            if t.location == location:
-                return t.transitions
-
-    def save_graph(self, name):
-        G = pgv.AGraph(directed=True, strict=False)
-
-        for st in self.state_trans:
-            G.add_node('{0}{1}'.format(self.name, st.location))
-
-        for st in self.state_trans:
-            src_location = '{0}{1}'.format(self.name, st.location)
-            for t in st.transitions:
-                G.add_edge(src_location, '{0}{1}'.format(self.name, t.location), label=t.label)
-
-        sorted(G.edges(keys=True))
-        if not os.path.isdir(self._dir_name):
-            os.mkdir(self._dir_name)
-
-        G.layout(prog='dot')
-        G.draw(os.path.join(self._dir_name, '{0}.png'.format(name)))
-
-class State:
-    def __init__(self, r0=None, p_list=None):
-        if r0 != None and p_list != None:
-            self.p_list = p_list
-            self.location = { p:p.state_trans[0].location for p in self.p_list }
-            self.shared_vars = r0
-            self._is_deadlock = True
-
-    def clone(self):
-        dst = State()
-        dst.location = copy.copy(self.location)
-        dst.shared_vars = self.shared_vars.clone()
-        dst.p_list = self.p_list
-        dst._is_deadlock = True
-        return dst
-
-    def check_deadlock(self):
-        self._is_deadlock = False
-
-    def is_deadlock(self):
-        return self._is_deadlock
-
-    def equal(self, target):
-        return self._is_same_location(target) and self._is_same_shared_vars(target)
-
-    def name(self):
-        return ' '.join(['{0}{1}'.format(p.name, self.location[p]) for p in self.p_list])
-
-    def to_str(self):
-        return '{0:8} {1}'.format(self.name(), self.shared_vars.to_str())
-
-    def to_graph_str(self, idx):
-        return '{0}\n{1}\n{2}'.format(idx, self.name(), self.shared_vars.to_graph_str())
-
-    def _is_same_location(self, target):
-        l0 = ' '.join([self.location[p] for p in self.p_list])
-        l1 = ' '.join([target.location[p] for p in self.p_list])
-        return l0 == l1
-
-    def _is_same_shared_vars(self, target):
-        return self.shared_vars.equal(target.shared_vars)
-
-class Path:
-    def create(path, state, tran, process):
-        new_path = copy.deepcopy(path)
-        new_path._add(state, tran, process)
-        return new_path
-
-    def __init__(self, s0):
-        self.list = [ {'s':s0, 't':None, 'p':None} ]
-
-    def _add(self, s, t, p):
-        self.list.insert(0, {'s':s, 't':t, 'p':p})
-
-    def get_state(self):
-        return (self.list[0])['s']
-
-    def print(self):
-        print('--------------------')
-        for idx, i in enumerate(reversed(self.list)):
-            if i['t'] == None:
-                str_tran = '{0:4} {1:10}'.format('---', '---')
-            else:
-                str_tran = '{0:4} {1:10}'.format(i['p'].name, i['t'].label)
-            print('{0:4} {1:14} {2:32}'.format(idx, str_tran, i['s'].to_str()))
-
-class LtsTbl:
-    _dir_name = 'img'
-
-    def __init__(self, key):
-        self._idx_of_prev_state = 0
-        self._idx_of_who = 1
-        self._idx_of_tran = 2
-        self._idx_of_direction = 3
-        self._tbl = { key: [ (None, None, None, None) ] }
-        self._key_to_id = { key:0 }
-
-    def add(self, key, prev_state, who, tran):
-        ret = False
-        keys = [ k for k in self._tbl.keys() if k.equal(key) ]
-        if not keys:
-            self._tbl[key] = [ (prev_state, who, tran, 'foward') ]
-            self._key_to_id[key] = len(self._key_to_id)
-            ret = True
-        elif keys and [ k for k in self._tbl.keys() if k.equal(prev_state) ]:
-            self._tbl[prev_state].append((keys[0], who, tran, 'reverse'))
-        return ret
-
-    def save_graph(self, name):
-        G = pgv.AGraph(directed=True, strict=False)
-
-        for i, k in enumerate(self._tbl):
-            if self._tbl[k][self._idx_of_prev_state] == (None, None, None, None):
-                G.add_node(k.to_graph_str(self._key_to_id[k]), style='filled', fillcolor='cyan')
-            elif k.is_deadlock():
-                G.add_node(k.to_graph_str(self._key_to_id[k]), style='filled', fillcolor='pink')
-            else:
-                G.add_node(k.to_graph_str(self._key_to_id[k]))
-
-        for k, pair in [(k, pair) for k in (self._tbl) for pair in self._tbl[k] if pair != (None, None, None, None)]:
-            if pair[self._idx_of_direction] == 'foward':
-                src = pair[self._idx_of_prev_state].to_graph_str(self._key_to_id[pair[self._idx_of_prev_state]])
-                dst = k.to_graph_str(self._key_to_id[k])
-            elif pair[self._idx_of_direction] == 'reverse':
-                src = k.to_graph_str(self._key_to_id[k])
-                dst = pair[self._idx_of_prev_state].to_graph_str(self._key_to_id[pair[self._idx_of_prev_state]])
-
-            action = '{0}.{1}'.format(pair[self._idx_of_who].name, pair[self._idx_of_tran].label)
-            G.add_edge(src, dst, label=action)
-
-        sorted(G.edges(keys=True))
-        if not os.path.isdir(self._dir_name):
-            os.mkdir(self._dir_name)
-
-        G.layout(prog='dot')
-        G.draw(os.path.join(self._dir_name, '{0}.png'.format(name)))
-
-def concurrent_composition(process_list, r0, name):
-    s0 = State(r0, process_list)
-    lts_tbl = bfs(process_list, s0)
-    return lts_tbl
-
-def bfs(process_list, s0):
-    lts_tb = LtsTbl(s0)
-    path = Path(s0)
-    queue = [ path ]
-
-    while queue:
-        path = queue.pop(0)
-        s = path.get_state()
-        for p, tran in [ (p, tran) for p in process_list for tran in p.next_trans(s.location[p]) if tran.guard.exec(p, s)]:
-            t = s.clone()
-            t.location[p] = tran.location
-
-            tran.action.exec(p, t, s)
-            s.check_deadlock()
-
-            if lts_tb.add(t, s, p, tran):
-                queue.append(Path.create(path, t, tran, p))
-
-        if s.is_deadlock():
-            path.print()
-
-    return lts_tb
+import ast
+import bisect
+import heapq
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import random
+import shutil
+import struct
+import tempfile
+import weakref
+import zlib
+from array import array
+from collections import deque
+from xml.sax.saxutils import escape as xml_escape
+
+try:
+    import pygraphviz as pgv
+except ImportError:
+    pgv = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from abc import ABCMeta
+from abc import abstractmethod
+
+class SharedVarsInterface(metaclass=ABCMeta):
+    @abstractmethod
+    def clone(self):
+        pass
+
+    @abstractmethod
+    def equal(self, target):
+        pass
+
+    @abstractmethod
+    def to_str(self):
+        pass
+
+    @abstractmethod
+    def to_graph_str(self):
+        pass
+
+    def key(self):
+        return None
+
+    def restore(self, key):
+        return None
+
+    def permute(self, key, perm):
+        return None
+
+    def process_key(self, key, idx):
+        return None
+
+class Action(metaclass=ABCMeta):
+    @abstractmethod
+    def exec(self, process, dest, src):
+        pass
+
+    def apply(self, idx, process, dest, src):
+        self.exec(process, dest, src)
+
+    def reads(self, process):
+        return None
+
+    def writes(self, process):
+        return None
+
+class Guard(metaclass=ABCMeta):
+    @abstractmethod
+    def exec(self, process, state):
+        pass
+
+    def test(self, idx, process, state):
+        return self.exec(process, state)
+
+    def reads(self, process):
+        return None
+
+class GuardTrue(Guard):
+    def exec(self, process, state):
+        return True
+
+    def reads(self, process):
+        return ()
+
+class ActionNop(Action):
+    def exec(self, process, dest, src):
+        pass
+
+    def reads(self, process):
+        return ()
+
+    def writes(self, process):
+        return ()
+
+class Var:
+    def __init__(self, name, domain, size=None, per_process=False):
+        self.name = name
+        self.domain = domain
+        self.size = size
+        self.per_process = per_process
+
+    def initial(self):
+        return False if self.domain == bool else self.domain[0]
+
+class Schema:
+    def __init__(self, fields, consts=None):
+        self.fields = fields
+        self.consts = consts if consts != None else {}
+        self._field = { f.name:f for f in fields }
+        self._offset = {}
+        self.width = 0
+        for f in fields:
+            self._offset[f.name] = self.width
+            self.width += f.size if f.size != None else 1
+
+    def vars(self, **values):
+        v = []
+        for f in self.fields:
+            init = values.get(f.name, f.initial() if f.size == None else [ f.initial() ] * f.size)
+            v.extend([ init ] if f.size == None else init)
+        return PackedVars(self, v)
+
+    def guard(self, expr):
+        return ExprGuard(self, expr)
+
+    def action(self, assigns):
+        return ExprAction(self, assigns)
+
+    def _compile(self, name, body, reads):
+        src = 'def {0}(d, s, pid):\n{1}'.format(name, ''.join([ '    {0}\n'.format(line) for line in body ]))
+        ns = {}
+        exec(compile(src, '<ddsv.Schema>', 'exec'), { 'ValueError': ValueError, '_checked_index': _checked_index }, ns)
+        return ns[name], tuple(sorted(reads, key=str))
+
+    def compile_guard(self, expr):
+        reads = set()
+        code = self._expr(expr, reads)
+        return self._compile('_guard', [ 'return bool({0})'.format(code) ], reads)
+
+    def compile_action(self, assigns):
+        reads = set()
+        writes = set()
+        body = []
+        for target, expr in assigns.items():
+            code = self._expr(expr, reads)
+            field, elem, idx = self._target(target, reads)
+            writes.add(elem)
+            body.append('d[{0}] = {1}'.format(idx, 'bool({0})'.format(code) if field.domain == bool else code))
+            if field.domain != bool:
+                body.append('if not {0} <= d[{1}] < {2}: raise ValueError({3!r})'.format(
+                    field.domain.start, idx, field.domain.stop, '{0} out of domain'.format(field.name)))
+        fn, reads = self._compile('_action', body if body else [ 'pass' ], reads)
+        return fn, reads, tuple(sorted(writes, key=str))
+
+    def compile_vector_guard(self, expr, pid, base):
+        code = self._vector_expr(expr, pid, base)
+        return self._compile_vector('_vguard', [ 'return {0}'.format(code) ])
+
+    def compile_vector_action(self, assigns, pid, base):
+        body = []
+        for target, expr in assigns.items():
+            f, col = self._vector_target(target, pid, base)
+            body.append('D[:, {0}] = {1}'.format(col, self._vector_expr(expr, pid, base)))
+            if f.domain != bool:
+                body.append('if ((D[:, {0}] < {1}) | ({2} <= D[:, {0}])).any(): raise ValueError({3!r})'.format(
+                    col, f.domain.start, f.domain.stop, '{0} out of domain'.format(f.name)))
+        return self._compile_vector('_vaction', body if body else [ 'pass' ])
+
+    def _compile_vector(self, name, body):
+        src = 'def {0}(D, S):\n{1}'.format(name, ''.join([ '    {0}\n'.format(line) for line in body ]))
+        ns = {}
+        exec(compile(src, '<ddsv.Schema>', 'exec'), { 'ValueError': ValueError, 'np': np }, ns)
+        return ns[name]
+
+    def _vector_expr(self, expr, pid, base):
+        tree = _VectorPacker(self, pid, base).visit(ast.parse(expr, mode='eval'))
+        return ast.unparse(ast.fix_missing_locations(tree))
+
+    def _vector_target(self, target, pid, base):
+        node = ast.parse(target, mode='eval').body
+        name = node.value.id if isinstance(node, ast.Subscript) else getattr(node, 'id', None)
+        f = self._field.get(name)
+        if f == None:
+            raise ValueError('unknown variable {0}'.format(target))
+        col = ast.unparse(_VectorPacker(self, pid, base).visit(node))
+        return f, col[len('S[:, '):-1]
+
+    def _expr(self, expr, reads):
+        tree = _Packer(self, reads).visit(ast.parse(expr, mode='eval'))
+        return ast.unparse(ast.fix_missing_locations(tree))
+
+    def _target(self, target, reads):
+        node = ast.parse(target, mode='eval').body
+        if isinstance(node, ast.Subscript):
+            name, idx = getattr(node.value, 'id', None), node.slice
+        else:
+            name, idx = getattr(node, 'id', None), None
+
+        f = self._field.get(name)
+        if f == None or (f.size == None) != (idx == None):
+            raise ValueError('unknown variable {0}'.format(target))
+        if idx == None:
+            return f, f.name, str(self._offset[name])
+        return f, _element(self, f, idx), '{0} + {1}'.format(self._offset[name], ast.unparse(_index_node(f, _Packer(self, reads).visit(idx))))
+
+def _checked_index(idx, size, name):
+    if not 0 <= idx < size:
+        raise ValueError('{0}[{1}] out of range'.format(name, idx))
+    return idx
+
+# a constant or pid index names a single element, so c[0] and c[1] do not conflict under POR;
+# ('c', 'pid') is resolved to the executing process by _footprint()
+def _element(schema, f, idx):
+    if isinstance(idx, ast.Constant):
+        return (f.name, idx.value)
+    if isinstance(idx, ast.Name) and idx.id == 'pid':
+        return (f.name, 'pid')
+    if isinstance(idx, ast.Name) and idx.id in schema.consts:
+        return (f.name, schema.consts[idx.id])
+    return f.name
+
+def _index_node(f, idx):
+    if isinstance(idx, ast.Constant):
+        if not 0 <= idx.value < f.size:
+            raise ValueError('{0}[{1}] out of range'.format(f.name, idx.value))
+        return idx
+    return ast.Call(ast.Name('_checked_index', ast.Load()), [ idx, ast.Constant(f.size), ast.Constant(f.name) ], [])
+
+class _Packer(ast.NodeTransformer):
+    def __init__(self, schema, reads):
+        self._schema = schema
+        self._reads = reads
+
+    def visit_Name(self, node):
+        if node.id == 'pid':
+            return node
+        if node.id in self._schema.consts:
+            return ast.Constant(self._schema.consts[node.id])
+        f = self._schema._field.get(node.id)
+        if f == None or f.size != None:
+            raise ValueError('unknown scalar variable {0}'.format(node.id))
+        self._reads.add(f.name)
+        return ast.Subscript(ast.Name('s', ast.Load()), ast.Constant(self._schema._offset[f.name]), ast.Load())
+
+    def visit_Subscript(self, node):
+        f = self._schema._field.get(getattr(node.value, 'id', None))
+        if f == None or f.size == None:
+            raise ValueError('unknown array variable {0}'.format(ast.unparse(node.value)))
+        self._reads.add(_element(self._schema, f, node.slice))
+        idx = ast.BinOp(ast.Constant(self._schema._offset[f.name]), ast.Add(), _index_node(f, self.visit(node.slice)))
+        return ast.Subscript(ast.Name('s', ast.Load()), idx, ast.Load())
+
+    def visit_Call(self, node):
+        raise ValueError('function calls are not allowed in expressions')
+
+    def visit_Attribute(self, node):
+        raise ValueError('attribute access is not allowed in expressions')
+
+class _VectorPacker(ast.NodeTransformer):
+    def __init__(self, schema, pid, base):
+        self._schema = schema
+        self._pid = pid
+        self._base = base
+
+    def _column(self, idx):
+        return ast.Subscript(ast.Name('S', ast.Load()), ast.Tuple([ ast.Slice(), ast.Constant(self._base + idx) ], ast.Load()), ast.Load())
+
+    def _truth(self, node):
+        return ast.Compare(self.visit(node), [ ast.NotEq() ], [ ast.Constant(0) ])
+
+    def visit_Name(self, node):
+        if node.id == 'pid':
+            return ast.Constant(self._pid)
+        if node.id in self._schema.consts:
+            return ast.Constant(self._schema.consts[node.id])
+        f = self._schema._field.get(node.id)
+        if f == None or f.size != None:
+            raise ValueError('unknown scalar variable {0}'.format(node.id))
+        return self._column(self._schema._offset[f.name])
+
+    def visit_Subscript(self, node):
+        f = self._schema._field.get(getattr(node.value, 'id', None))
+        if f == None or f.size == None:
+            raise ValueError('unknown array variable {0}'.format(ast.unparse(node.value)))
+        idx = ast.Expression(ast.fix_missing_locations(self.visit(node.slice)))
+        try:
+            k = eval(compile(idx, '<ddsv.Schema>', 'eval'), {})
+        except NameError:
+            raise ValueError('array index of {0} must be constant for each process'.format(f.name))
+        if not 0 <= k < f.size:
+            raise ValueError('{0}[{1}] out of range'.format(f.name, k))
+        return self._column(self._schema._offset[f.name] + k)
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            return ast.Compare(self.visit(node.operand), [ ast.Eq() ], [ ast.Constant(0) ])
+        return self.generic_visit(node)
+
+    def visit_BoolOp(self, node):
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        res = self._truth(node.values[0])
+        for v in node.values[1:]:
+            res = ast.BinOp(res, op, self._truth(v))
+        return res
+
+    def visit_Compare(self, node):
+        terms = [ self.visit(node.left) ] + [ self.visit(c) for c in node.comparators ]
+        res = None
+        for op, l, r in zip(node.ops, terms, terms[1:]):
+            c = ast.Compare(l, [ op ], [ r ])
+            res = c if res == None else ast.BinOp(res, ast.BitAnd(), c)
+        return res
+
+    def visit_IfExp(self, node):
+        where = ast.Attribute(ast.Name('np', ast.Load()), 'where', ast.Load())
+        return ast.Call(where, [ self._truth(node.test), self.visit(node.body), self.visit(node.orelse) ], [])
+
+    def visit_Call(self, node):
+        raise ValueError('function calls are not allowed in expressions')
+
+    def visit_Attribute(self, node):
+        raise ValueError('attribute access is not allowed in expressions')
+
+class PackedVars(SharedVarsInterface):
+    def __init__(self, schema, v):
+        self.schema = schema
+        self.v = v
+
+    def __getattr__(self, name):
+        schema = self.__dict__.get('schema')
+        if schema == None or name not in schema._field:
+            raise AttributeError(name)
+        f = schema._field[name]
+        return self.v[schema._offset[name]] if f.size == None else _FieldView(self, f)
+
+    def __setattr__(self, name, value):
+        if name in ('schema', 'v'):
+            object.__setattr__(self, name, value)
+            return
+        f = self.schema._field.get(name)
+        if f == None:
+            raise AttributeError('{0} is not a field of this schema'.format(name))
+        off = self.schema._offset[name]
+        if f.size == None:
+            self.v[off] = _field_value(f, value)
+            return
+        value = list(value)
+        if len(value) != f.size:
+            raise ValueError('{0} needs {1} values'.format(name, f.size))
+        self.v[off:off + f.size] = [ _field_value(f, x) for x in value ]
+
+    def clone(self):
+        return PackedVars(self.schema, list(self.v))
+
+    def equal(self, target):
+        return self.v == target.v
+
+    def key(self):
+        return tuple(self.v)
+
+    def restore(self, key):
+        return PackedVars(self.schema, list(key))
+
+    def permute(self, key, perm):
+        key = list(key)
+        for f in self.schema.fields:
+            if f.per_process:
+                off = self.schema._offset[f.name]
+                key[off:off + f.size] = [ key[off + i] for i in perm ]
+        return tuple(key)
+
+    def process_key(self, key, idx):
+        return tuple([ key[self.schema._offset[f.name] + idx] for f in self.schema.fields if f.per_process ])
+
+    def to_str(self):
+        out = []
+        for f in self.schema.fields:
+            off = self.schema._offset[f.name]
+            if f.size == None:
+                out.append('{0}={1}'.format(f.name, int(self.v[off]) if f.domain == bool else self.v[off]))
+            else:
+                out.extend([ '{0}[{1}]={2}'.format(f.name, i, int(x) if f.domain == bool else x) for i, x in enumerate(self.v[off:off + f.size]) ])
+        return ' '.join(out)
+
+    def to_graph_str(self):
+        return self.to_str()
+
+def _field_value(f, value):
+    if f.domain == bool:
+        return bool(value)
+    if not f.domain.start <= value < f.domain.stop:
+        raise ValueError('{0} out of domain'.format(f.name))
+    return value
+
+class _FieldView:
+    # an array field of PackedVars; element assignments write through to the packed vector
+    def __init__(self, packed, field):
+        self._packed = packed
+        self._field = field
+        self._off = packed.schema._offset[field.name]
+
+    def __len__(self):
+        return self._field.size
+
+    def __iter__(self):
+        return iter(self._packed.v[self._off:self._off + self._field.size])
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return list(self)[idx]
+        return self._packed.v[self._off + _checked_index(idx, self._field.size, self._field.name)]
+
+    def __setitem__(self, idx, value):
+        self._packed.v[self._off + _checked_index(idx, self._field.size, self._field.name)] = _field_value(self._field, value)
+
+    def __eq__(self, target):
+        return list(self) == list(target)
+
+    def __repr__(self):
+        return repr(list(self))
+
+class ExprGuard(Guard):
+    def __init__(self, schema, expr):
+        self.expr = expr
+        self._fn, self._reads = schema.compile_guard(expr)
+
+    def exec(self, process, state):
+        return self._fn(None, state.shared_vars.v, state.p_list.index(process))
+
+    def test(self, idx, process, state):
+        return self._fn(None, state.shared_vars.v, idx)
+
+    def reads(self, process):
+        return self._reads
+
+class ExprAction(Action):
+    def __init__(self, schema, assigns):
+        self.assigns = assigns
+        self._fn, self._reads, self._writes = schema.compile_action(assigns)
+
+    def exec(self, process, dest, src):
+        self._fn(dest.shared_vars.v, src.shared_vars.v, dest.p_list.index(process))
+
+    def apply(self, idx, process, dest, src):
+        self._fn(dest.shared_vars.v, src.shared_vars.v, idx)
+
+    def reads(self, process):
+        return self._reads
+
+    def writes(self, process):
+        return self._writes
+
+class StateTransition:
+    def __init__(self, location, trans_list):
+        self.location = location
+        self.transitions = trans_list
+
+def _check_fairness(fairness):
+    if fairness not in (None, 'weak', 'strong'):
+        raise ValueError('fairness must be None, \'weak\' or \'strong\': {0}'.format(fairness))
+    return fairness
+
+class Transition:
+    def __init__(self, label, location, guard, action, fairness=None):
+        self.label = label
+        self.location = location
+        self.guard = guard
+        self.action = action
+        self.fairness = _check_fairness(fairness)
+
+    def to_str(self):
+        return '{0} {1}'.format(self.label, self.location)
+
+class Process:
+    _dir_name = 'img'
+
+    def __init__(self, name, state_trans, fairness=None):
+        self.name = name
+        self.state_trans = state_trans
+        self.fairness = _check_fairness(fairness)
+        self._loc_names = []
+        self._loc_ids = {}
+        self._trans = []
+        for st in self.state_trans:
+            self._intern(st.location)
+            for t in st.transitions:
+                self._intern(t.location)
+
+        for st in reversed(self.state_trans):
+            self._trans[self._loc_ids[st.location]] = st.transitions
+
+    def _intern(self, location):
+        if location not in self._loc_ids:
+            self._loc_ids[location] = len(self._loc_names)
+            self._loc_names.append(location)
+            self._trans.append(None)
+
+    def loc_id(self, location):
+        idx = self._loc_ids.get(location)
+        if idx == None:
+            raise ValueError('{0}: unknown location {1}'.format(self.name, location))
+        return idx
+
+    def loc_name(self, idx):
+        return self._loc_names[idx]
+
+    def trans_at(self, idx):
+        trans = self._trans[idx]
+        if trans == None:
+            raise ValueError('{0}: no transitions declared for location {1}'.format(self.name, self._loc_names[idx]))
+        return trans
+
+    def next_trans(self, location):
+        return self.trans_at(self.loc_id(location))
+
+    def fairness_constraints(self):
+        res = []
+        if self.fairness != None:
+            res.append((self.fairness, self, None))
+        for st in self.state_trans:
+            for tran in st.transitions:
+                if tran.fairness != None:
+                    res.append((tran.fairness, self, tran))
+        return res
+
+    def save_graph(self, name):
+        if pgv == None:
+            raise ImportError('save_graph needs pygraphviz')
+        G = pgv.AGraph(directed=True, strict=False)
+
+        for st in self.state_trans:
+            G.add_node('{0}{1}'.format(self.name, st.location))
+
+        for st in self.state_trans:
+            src_location = '{0}{1}'.format(self.name, st.location)
+            for t in st.transitions:
+                G.add_edge(src_location, '{0}{1}'.format(self.name, t.location), label=t.label)
+
+        sorted(G.edges(keys=True))
+        if not os.path.isdir(self._dir_name):
+            os.mkdir(self._dir_name)
+
+        G.layout(prog='dot')
+        G.draw(os.path.join(self._dir_name, '{0}.png'.format(name)))
+
+class State:
+    __slots__ = ('p_list', 'locs', 'shared_vars', '_hash')
+
+    def __init__(self, r0=None, p_list=None):
+        self._hash = None
+        if r0 != None and p_list != None:
+            self.p_list = p_list
+            self.locs = tuple([ p.loc_id(p.state_trans[0].location) for p in self.p_list ])
+            self.shared_vars = r0
+
+    @staticmethod
+    def restore(p_list, r0, fp):
+        dst = State()
+        dst.p_list = p_list
+        dst.locs = fp[0]
+        dst.shared_vars = r0.restore(fp[1])
+        dst._hash = hash(fp)
+        return dst
+
+    def __eq__(self, target):
+        return isinstance(target, State) and self.equal(target)
+
+    def __hash__(self):
+        if self._hash == None:
+            self._hash = hash(self.fingerprint())
+        return self._hash
+
+    @property
+    def location(self):
+        return { p:p.loc_name(i) for p, i in zip(self.p_list, self.locs) }
+
+    def clone(self):
+        dst = State()
+        dst.p_list = self.p_list
+        dst.locs = self.locs
+        dst.shared_vars = self.shared_vars.clone()
+        return dst
+
+    def successors(self):
+        return [ (i, p, tran) for i, p in enumerate(self.p_list) for tran in p.trans_at(self.locs[i]) if tran.guard.test(i, p, self) ]
+
+    def successor(self, idx, tran):
+        p = self.p_list[idx]
+        dst = self.clone()
+        dst.locs = self.locs[:idx] + (p._loc_ids[tran.location],) + self.locs[idx + 1:]
+        tran.action.apply(idx, p, dst, self)
+        return dst
+
+    def equal(self, target):
+        return self._is_same_location(target) and self._is_same_shared_vars(target)
+
+    def fingerprint(self):
+        return (self.locs, self.shared_vars.key())
+
+    def name(self):
+        return ' '.join(['{0}{1}'.format(p.name, p.loc_name(i)) for p, i in zip(self.p_list, self.locs)])
+
+    def to_str(self):
+        return '{0:8} {1}'.format(self.name(), self.shared_vars.to_str())
+
+    def to_graph_str(self, idx):
+        return '{0}\n{1}\n{2}'.format(idx, self.name(), self.shared_vars.to_graph_str())
+
+    def _is_same_location(self, target):
+        return self.locs == target.locs
+
+    def _is_same_shared_vars(self, target):
+        k0 = self.shared_vars.key()
+        if k0 == None:
+            return self.shared_vars.equal(target.shared_vars)
+        return k0 == target.shared_vars.key()
+
+class Path:
+    def __init__(self, s0):
+        self.list = [ {'s':s0, 't':None, 'p':None} ]
+
+    def _add(self, s, t, p):
+        self.list.insert(0, {'s':s, 't':t, 'p':p})
+
+    def get_state(self):
+        return (self.list[0])['s']
+
+    def print(self):
+        print('--------------------')
+        for idx, i in enumerate(reversed(self.list)):
+            if i['t'] == None:
+                str_tran = '{0:4} {1:10}'.format('---', '---')
+            else:
+                str_tran = '{0:4} {1:10}'.format('---' if i['p'] == None else i['p'].name, i['t'].label)
+            print('{0:4} {1:14} {2:32}'.format(idx, str_tran, i['s'].to_str()))
+
+class GraphWriter(metaclass=ABCMeta):
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, 'w')
+        self._begin()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._f != None:
+            self._end()
+            self._f.close()
+            self._f = None
+
+    def _begin(self):
+        pass
+
+    def _end(self):
+        pass
+
+    @abstractmethod
+    def node(self, idx, label, color=None):
+        pass
+
+    @abstractmethod
+    def edge(self, src, dst, label):
+        pass
+
+class DotWriter(GraphWriter):
+    def _begin(self):
+        self._f.write('digraph {\n')
+
+    def _end(self):
+        self._f.write('}\n')
+
+    def _quote(self, text):
+        return '"{0}"'.format(text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+
+    def node(self, idx, label, color=None):
+        if color == None:
+            self._f.write('{0} [label={1}];\n'.format(idx, self._quote(label)))
+        else:
+            self._f.write('{0} [label={1}, style=filled, fillcolor={2}];\n'.format(idx, self._quote(label), color))
+
+    def edge(self, src, dst, label):
+        self._f.write('{0} -> {1} [label={2}];\n'.format(src, dst, self._quote(label)))
+
+class JsonLinesWriter(GraphWriter):
+    def node(self, idx, label, color=None):
+        self._f.write(json.dumps({ 'node': idx, 'label': label, 'color': color }) + '\n')
+
+    def edge(self, src, dst, label):
+        self._f.write(json.dumps({ 'src': src, 'dst': dst, 'label': label }) + '\n')
+
+class GraphmlWriter(GraphWriter):
+    def _begin(self):
+        self._f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self._f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        self._f.write('<key id="label" for="all" attr.name="label" attr.type="string"/>\n')
+        self._f.write('<key id="color" for="node" attr.name="color" attr.type="string"/>\n')
+        self._f.write('<graph edgedefault="directed">\n')
+        self._edges = 0
+
+    def _end(self):
+        self._f.write('</graph>\n</graphml>\n')
+
+    def node(self, idx, label, color=None):
+        self._f.write('<node id="n{0}"><data key="label">{1}</data>'.format(idx, xml_escape(label)))
+        if color != None:
+            self._f.write('<data key="color">{0}</data>'.format(color))
+        self._f.write('</node>\n')
+
+    def edge(self, src, dst, label):
+        self._f.write('<edge id="e{0}" source="n{1}" target="n{2}"><data key="label">{3}</data></edge>\n'.format( \
+            self._edges, src, dst, xml_escape(label)))
+        self._edges += 1
+
+_writers = { 'dot': DotWriter, 'jsonl': JsonLinesWriter, 'graphml': GraphmlWriter }
+
+def graph_writer(path, format=None):
+    if format == None:
+        format = os.path.splitext(path)[1][1:]
+    if format not in _writers:
+        raise ValueError('unknown graph format {0}; expected one of {1}'.format(format, ', '.join(sorted(_writers))))
+    return _writers[format](path)
+
+def render_png(dot_path, png_path=None):
+    if pgv == None:
+        raise ImportError('render_png needs pygraphviz')
+    if png_path == None:
+        png_path = os.path.splitext(dot_path)[0] + '.png'
+    G = pgv.AGraph(dot_path)
+    G.layout(prog='dot')
+    G.draw(png_path)
+    return png_path
+
+def _action_label(who, tran):
+    if who == None:
+        return tran.label
+    return '{0}.{1}'.format(who.name, tran.label)
+
+def _csr(n, keys, values):
+    start = array('q', bytes(8 * (n + 1)))
+    for k in keys:
+        start[k + 1] += 1
+    for i in range(n):
+        start[i + 1] += start[i]
+
+    pos = array('q', start)
+    edge = array('q', bytes(8 * len(keys)))
+    other = array('q', bytes(8 * len(keys)))
+    for e, k in enumerate(keys):
+        edge[pos[k]] = e
+        other[pos[k]] = values[e]
+        pos[k] += 1
+    return start, edge, other
+
+class EdgeStore:
+    def __init__(self, n, p_list, src, dst, who, tran):
+        self.n = n
+        self.p_list = p_list
+        self.src = src
+        self.dst = dst
+        self.who = who
+        self.tran = tran
+        self._trans = [ _flat_trans(p) for p in p_list ]
+        self._labels = {}
+        self.out_start, self.out_edge, self.out_dst = _csr(n, src, dst)
+        self.in_start, self.in_edge, self.in_src = _csr(n, dst, src)
+
+    @staticmethod
+    def build(lts_tbl):
+        return EdgeStore(len(lts_tbl._id_to_key), lts_tbl._p_list,
+                         lts_tbl._src[:], lts_tbl._dst[:], lts_tbl._who[:], lts_tbl._tran[:])
+
+    def __len__(self):
+        return len(self.src)
+
+    def successors(self, v):
+        return self.out_dst[self.out_start[v]:self.out_start[v + 1]]
+
+    def predecessors(self, v):
+        return self.in_src[self.in_start[v]:self.in_start[v + 1]]
+
+    def process(self, e):
+        return None if self.who[e] == -1 else self.p_list[self.who[e]]
+
+    def transition(self, e):
+        return tau if self.who[e] == -1 else self._trans[self.who[e]][self.tran[e]]
+
+    def label(self, e):
+        k = (self.who[e], self.tran[e])
+        if k not in self._labels:
+            self._labels[k] = _action_label(self.process(e), self.transition(e))
+        return self._labels[k]
+
+class GraphView(metaclass=ABCMeta):
+    @abstractmethod
+    def select(self, lts_tbl):
+        pass
+
+    def _induced(self, lts_tbl, ids):
+        store = lts_tbl.edge_store()
+        ids = sorted(ids)
+        inside = set(ids)
+        chosen = sorted([ e for v in ids for e in store.out_edge[store.out_start[v]:store.out_start[v + 1]] if store.dst[e] in inside ])
+        edges = [ (store.src[e], store.dst[e], store.label(e)) for e in chosen ]
+        return ids, edges, {}
+
+def _neighbors(store, v):
+    return list(store.successors(v)) + list(store.predecessors(v))
+
+class Neighborhood(GraphView):
+    def __init__(self, center, k=1):
+        self.center = center
+        self.k = k
+
+    def _ids(self, lts_tbl, center):
+        if isinstance(center, int):
+            return [ center ]
+        if isinstance(center, State):
+            return [ self._id_of(lts_tbl, center) ]
+        if isinstance(center, Path):
+            return [ self._id_of(lts_tbl, i['s']) for i in center.list ]
+        if isinstance(center, Violation):
+            return self._ids(lts_tbl, center.path)
+        return [ idx for c in center for idx in self._ids(lts_tbl, c) ]
+
+    def _id_of(self, lts_tbl, s):
+        idx = lts_tbl.id_of(s)
+        if idx == None:
+            raise ValueError('state is not in the LTS: {0}'.format(s.to_str()))
+        return idx
+
+    def select(self, lts_tbl):
+        store = lts_tbl.edge_store()
+        seen = set(self._ids(lts_tbl, self.center))
+        frontier = list(seen)
+        for _ in range(self.k):
+            frontier = [ w for v in frontier for w in _neighbors(store, v) if w not in seen ]
+            seen.update(frontier)
+        return self._induced(lts_tbl, seen)
+
+class DeadlockTraces(GraphView):
+    def select(self, lts_tbl):
+        seen = set()
+        for idx in lts_tbl._deadlock_ids():
+            while idx != -1 and idx not in seen:
+                seen.add(idx)
+                idx = lts_tbl._prev[idx]
+        return self._induced(lts_tbl, seen)
+
+class Condensation(GraphView):
+    def __init__(self, max_labels=3):
+        self.max_labels = max_labels
+
+    def select(self, lts_tbl):
+        store = lts_tbl.edge_store()
+        n = store.n
+        rep = [ 0 ] * n
+        notes = {}
+        for comp in _sccs(n, [ store.successors(v) for v in range(n) ]):
+            r = min(comp)
+            for v in comp:
+                rep[v] = r
+            if 1 < len(comp):
+                notes[r] = '\n[{0} states]'.format(len(comp))
+
+        labels = {}
+        for e in range(len(store)):
+            a, b = rep[store.src[e]], rep[store.dst[e]]
+            if a != b:
+                labels.setdefault((a, b), []).append(store.label(e))
+
+        res = []
+        for (a, b), names in labels.items():
+            names = sorted(set(names))
+            if self.max_labels < len(names):
+                names = names[:self.max_labels] + [ '...' ]
+            res.append((a, b, '\n'.join(names)))
+        return sorted(set(rep)), res, notes
+
+class Sample(GraphView):
+    def __init__(self, budget, seed=None):
+        self.budget = budget
+        self.seed = seed
+
+    def select(self, lts_tbl):
+        rng = random.Random(self.seed)
+        store = lts_tbl.edge_store()
+        seen = { 0 }
+        frontier = _neighbors(store, 0)
+        while frontier and len(seen) < self.budget:
+            i = rng.randrange(len(frontier))
+            frontier[i], frontier[-1] = frontier[-1], frontier[i]
+            v = frontier.pop()
+            if v not in seen:
+                seen.add(v)
+                frontier.extend([ w for w in _neighbors(store, v) if w not in seen ])
+        return self._induced(lts_tbl, seen)
+
+class LtsTbl:
+    _dir_name = 'img'
+
+    def __init__(self, key):
+        r0 = key.shared_vars
+        # states are kept as packed fingerprints and rebuilt on demand when SharedVars can restore them
+        self._packed = r0.key() != None and r0.restore(r0.key()) != None
+        self._flat = self._packed and isinstance(r0.key(), tuple)
+        self._n = len(key.p_list)
+        self._p_list = key.p_list
+        self._r0 = r0
+        self._key_to_id = {}
+        self._id_to_key = []
+        self._prev = array('q')
+        self._pwho = array('q')
+        self._ptran = array('q')
+        self._live = bytearray()
+        self._unexplored = set()
+        self._src = array('q')
+        self._dst = array('q')
+        self._who = array('q')
+        self._tran = array('q')
+        self._who_of = { p:i for i, p in enumerate(key.p_list) }
+        self._trans = [ _flat_trans(p) for p in key.p_list ]
+        self._tran_of = [ { t:j for j, t in enumerate(trans) } for trans in self._trans ]
+        self._store = None
+        self._insert(self._key(key), None, None, None)
+
+    def _key(self, s):
+        return self._pack(s.fingerprint()) if self._packed else s
+
+    def _pack(self, fp):
+        return fp[0] + fp[1] if self._flat else fp
+
+    def _fp(self, idx):
+        k = self._id_to_key[idx]
+        return (k[:self._n], k[self._n:]) if self._flat else k
+
+    def _insert(self, k, prev, who, tran):
+        idx = len(self._id_to_key)
+        self._key_to_id[k] = idx
+        self._id_to_key.append(k)
+        self._prev.append(-1 if prev == None else prev)
+        i, j = self._code(who, tran)
+        self._pwho.append(i)
+        self._ptran.append(j)
+        self._live.append(0)
+        return idx
+
+    def _code(self, who, tran):
+        if who == None:
+            return -1, -1
+        i = self._who_of[who]
+        return i, self._tran_of[i][tran]
+
+    def __len__(self):
+        return len(self._id_to_key)
+
+    def id_of(self, s):
+        return self._key_to_id.get(self._key(s))
+
+    def state(self, idx):
+        if self._packed:
+            return State.restore(self._p_list, self._r0, self._fp(idx))
+        return self._id_to_key[idx]
+
+    def shared_vars(self, idx):
+        if self._packed:
+            return self._r0.restore(self._fp(idx)[1])
+        return self._id_to_key[idx].shared_vars
+
+    def parent(self, idx):
+        prev = self._prev[idx]
+        if prev == -1:
+            return None, None, None
+        i = self._pwho[idx]
+        if i == -1:
+            return prev, None, tau
+        return prev, self._p_list[i], self._trans[i][self._ptran[idx]]
+
+    def _set_parent(self, idx, prev, who, tran):
+        self._prev[idx] = prev
+        self._pwho[idx], self._ptran[idx] = self._code(who, tran)
+
+    def find(self, key):
+        idx = self.id_of(key)
+        return None if idx == None else self.state(idx)
+
+    def add(self, key, prev_state, who, tran):
+        src = self.id_of(prev_state)
+        k = self._key(key)
+        dst = self._key_to_id.get(k)
+        ret = dst == None
+        if ret:
+            dst = self._insert(k, src, who, tran)
+        if src != None:
+            self._add_edge(src, dst, who, tran)
+        return ret
+
+    def _add_edge(self, src, dst, who, tran):
+        self._src.append(src)
+        self._dst.append(dst)
+        self._live[src] = 1
+        i, j = self._code(who, tran)
+        self._who.append(i)
+        self._tran.append(j)
+
+    def path(self, key):
+        return self._path(self.id_of(key))
+
+    def _path(self, idx):
+        trace = []
+        while idx != None:
+            prev, who, tran = self.parent(idx)
+            trace.append((self.state(idx), tran, who))
+            idx = prev
+
+        path = Path(trace.pop()[0])
+        for s, t, p in reversed(trace):
+            path._add(s, t, p)
+        return path
+
+    def _reindex(self):
+        self._key_to_id = { k:idx for idx, k in enumerate(self._id_to_key) }
+        self._live = bytearray(len(self._id_to_key))
+        for src in self._src:
+            self._live[src] = 1
+
+    def _deadlock_ids(self):
+        return [ idx for idx in range(len(self._id_to_key)) if not self._live[idx] and idx not in self._unexplored ]
+
+    def deadlocks(self):
+        return [ self.state(idx) for idx in self._deadlock_ids() ]
+
+    def edge_store(self):
+        if self._store == None or self._store.n != len(self._id_to_key) or len(self._store) != len(self._src):
+            self._store = EdgeStore.build(self)
+        return self._store
+
+    def edges(self):
+        store = self.edge_store()
+        return [ (store.src[e], store.process(e), store.transition(e), store.dst[e]) for e in range(len(store)) ]
+
+    def _color(self, idx):
+        if idx == 0:
+            return 'cyan'
+        if not self._live[idx] and idx not in self._unexplored:
+            return 'pink'
+        return None
+
+    def graph(self, view=None, label=None, color=None):
+        if label == None:
+            label = lambda idx: self.state(idx).to_graph_str(idx)
+        if color == None:
+            color = self._color
+
+        if view == None:
+            ids = range(len(self._id_to_key))
+            store = self.edge_store()
+            edges = [ (store.src[e], store.dst[e], store.label(e)) for e in range(len(store)) ]
+            notes = {}
+        else:
+            ids, edges, notes = view.select(self)
+        return [ (idx, label(idx) + notes.get(idx, ''), color(idx)) for idx in ids ], edges
+
+    def export(self, name, format='dot', view=None):
+        if not os.path.isdir(self._dir_name):
+            os.mkdir(self._dir_name)
+
+        with graph_writer(os.path.join(self._dir_name, '{0}.{1}'.format(name, format)), format) as w:
+            self.write(w, view)
+        return w.path
+
+    def write(self, writer, view=None, label=None, color=None):
+        nodes, edges = self.graph(view, label, color)
+        for idx, label, color in nodes:
+            writer.node(idx, label, color)
+        for src, dst, label in edges:
+            writer.edge(src, dst, label)
+
+    def save_graph(self, name, view=None):
+        if pgv == None:
+            raise ImportError('save_graph needs pygraphviz; use export() instead')
+        G = pgv.AGraph(directed=True, strict=False)
+
+        nodes, edges = self.graph(view)
+        for idx, label, color in nodes:
+            if color == None:
+                G.add_node(idx, label=label)
+            else:
+                G.add_node(idx, label=label, style='filled', fillcolor=color)
+
+        for src, dst, label in edges:
+            G.add_edge(src, dst, label=label)
+
+        sorted(G.edges(keys=True))
+        if not os.path.isdir(self._dir_name):
+            os.mkdir(self._dir_name)
+
+        G.layout(prog='dot')
+        G.draw(os.path.join(self._dir_name, '{0}.png'.format(name)))
+
+tau = Transition('tau', None, GuardTrue(), ActionNop())
+
+def _edge_label(who, tran, hidden):
+    if who == None:
+        return None
+    name = '{0}.{1}'.format(who.name, tran.label)
+    if name in hidden or tran.label in hidden:
+        return None
+    return name
+
+def _split(marked, block_of, blocks, xblock_of, xblocks, pending):
+    groups = {}
+    for s in marked:
+        groups.setdefault(block_of[s], []).append(s)
+    for b, members in groups.items():
+        if len(members) == len(blocks[b]):
+            continue
+        nb = len(blocks)
+        blocks.append(set(members))
+        blocks[b].difference_update(members)
+        for s in members:
+            block_of[s] = nb
+        x = xblock_of[b]
+        xblock_of.append(x)
+        xblocks[x].add(nb)
+        if len(xblocks[x]) == 2:
+            pending.append(x)
+
+def _strong_partition(n, edges, init):
+    # Paige-Tarjan relational coarsest partition, one count cell per (state, label, compound block)
+    block_of = []
+    blocks = []
+    index = {}
+    for s in range(n):
+        if init[s] not in index:
+            index[init[s]] = len(blocks)
+            blocks.append(set())
+        block_of.append(index[init[s]])
+        blocks[block_of[s]].add(s)
+    xblock_of = [ 0 ] * len(blocks)
+    xblocks = [ set(range(len(blocks))) ]
+    pending = [ 0 ] if 1 < len(blocks) else []
+
+    pred = [ [] for _ in range(n) ]
+    cell = []
+    cells = {}
+    for e, (s, a, t) in enumerate(edges):
+        pred[t].append(e)
+        if (s, a) not in cells:
+            cells[(s, a)] = [ 0 ]
+        cells[(s, a)][0] += 1
+        cell.append(cells[(s, a)])
+
+    enabled = {}
+    for s, a in cells:
+        enabled.setdefault(a, []).append(s)
+    for a in enabled:
+        _split(enabled[a], block_of, blocks, xblock_of, xblocks, pending)
+
+    while pending:
+        x = pending.pop()
+        if len(xblocks[x]) < 2:
+            continue
+
+        b0, b1 = list(itertools.islice(xblocks[x], 2))
+        b = b0 if len(blocks[b0]) <= len(blocks[b1]) else b1
+        xblocks[x].discard(b)
+        xblock_of[b] = len(xblocks)
+        xblocks.append({ b })
+        if 1 < len(xblocks[x]):
+            pending.append(x)
+
+        by_label = {}
+        for t in blocks[b]:
+            for e in pred[t]:
+                by_label.setdefault(edges[e][1], []).append(e)
+
+        for a, es in by_label.items():
+            count = {}
+            old = {}
+            for e in es:
+                s = edges[e][0]
+                count[s] = count.get(s, 0) + 1
+                old[s] = cell[e]
+            _split(list(count), block_of, blocks, xblock_of, xblocks, pending)
+            _split([ s for s in count if count[s] == old[s][0] ], block_of, blocks, xblock_of, xblocks, pending)
+
+            new = {}
+            for s in count:
+                old[s][0] -= count[s]
+                new[s] = [ count[s] ]
+            for e in es:
+                cell[e] = new[edges[e][0]]
+
+    return block_of
+
+def _branching_partition(n, edges, init):
+    # signature refinement; inert tau steps are those that stay inside a block
+    succ = [ [] for _ in range(n) ]
+    for s, a, t in edges:
+        succ[s].append((a, t))
+
+    block_of = _renumber(init)
+    while True:
+        sig = [ None ] * n
+        for comp in _inert_sccs(n, succ, block_of):
+            moves = set()
+            members = set(comp)
+            for s in comp:
+                for a, t in succ[s]:
+                    if a == None and block_of[t] == block_of[s]:
+                        if t not in members:
+                            moves |= sig[t]
+                    else:
+                        moves.add((a, block_of[t]))
+            for s in comp:
+                sig[s] = moves
+
+        refined = _renumber([ (block_of[s], frozenset(sig[s])) for s in range(n) ])
+        if max(refined) == max(block_of):
+            return refined
+        block_of = refined
+
+def _inert_sccs(n, succ, block_of):
+    inert = [ [ w for a, w in succ[v] if a == None and block_of[w] == block_of[v] ] for v in range(n) ]
+    return _sccs(n, inert)
+
+def _sccs(n, succ, inside=None):
+    index = [ -1 ] * n
+    low = [ 0 ] * n
+    on_stack = [ False ] * n
+    stack = []
+    counter = 0
+    for root in range(n):
+        if index[root] != -1 or (inside != None and not inside[root]):
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [ (root, 0) ]
+        while work:
+            v, i = work[-1]
+            if i < len(succ[v]):
+                work[-1] = (v, i + 1)
+                w = succ[v][i]
+                if inside != None and not inside[w]:
+                    continue
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], index[w])
+                continue
+
+            work.pop()
+            if work:
+                u = work[-1][0]
+                low[u] = min(low[u], low[v])
+            if low[v] == index[v]:
+                comp = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    comp.append(w)
+                    if w == v:
+                        break
+                yield comp
+
+def _renumber(keys):
+    index = {}
+    return [ index.setdefault(k, len(index)) for k in keys ]
+
+def _shared_key(s):
+    k = s.shared_vars.key()
+    return k if k != None else s.shared_vars.to_str()
+
+# key labels the states the quotient must keep apart; by default states with different shared
+# variables stay apart, so properties over shared variables survive. Locations are left out,
+# otherwise every state would start in a block of its own
+def minimize(lts_tbl, branching=False, hidden=None, key=None):
+    hidden = set(hidden) if hidden != None else set()
+    if key == None:
+        key = _shared_key
+    n = len(lts_tbl)
+    edges = []
+    trans = []
+    for src, who, tran, dst in lts_tbl.edges():
+        edges.append((src, _edge_label(who, tran, hidden), dst))
+        trans.append((who, tran))
+
+    init = [ key(lts_tbl.state(s)) for s in range(n) ]
+    if branching:
+        block_of = _branching_partition(n, edges, init)
+    else:
+        block_of = _strong_partition(n, edges, init)
+
+    moves = {}
+    for (s, a, t), (who, tran) in zip(edges, trans):
+        if branching and a == None and block_of[s] == block_of[t]:
+            continue
+        k = (block_of[s], a, block_of[t])
+        if k not in moves:
+            moves[k] = (None, tau) if a == None else (who, tran)
+
+    succ = {}
+    for (b, a, c), (who, tran) in moves.items():
+        succ.setdefault(b, []).append((c, who, tran))
+
+    reps = {}
+    for s in range(n):
+        if block_of[s] not in reps:
+            reps[block_of[s]] = lts_tbl.state(s).clone()
+
+    root = block_of[0]
+    quotient = LtsTbl(reps[root])
+    frontier = deque([ root ])
+    seen = { root }
+    while frontier:
+        b = frontier.popleft()
+        for c, who, tran in succ.get(b, []):
+            quotient.add(reps[c], reps[b], who, tran)
+            if c not in seen:
+                seen.add(c)
+                frontier.append(c)
+
+    quotient._unexplored = set([ quotient.id_of(reps[block_of[s]]) for s in lts_tbl._unexplored ])
+    quotient._block_of = [ quotient.id_of(reps[b]) for b in block_of ]
+    return quotient
+
+class SearchStrategy(metaclass=ABCMeta):
+    _checkable = True
+    _checkpointable = True
+
+    def __init__(self, max_depth=None, por=False, symmetry=None):
+        self.max_depth = max_depth
+        self.por = por
+        self.symmetry = symmetry
+        self.checkpoint_path = None
+        self.checkpoint_every = 0
+        self._saved = (0, 0)
+        self._dirty = set()
+        self._safe = {}
+        self._groups = []
+        self._expanded = set()
+        self._monitor = None
+        self._exporter = None
+
+    @abstractmethod
+    def _pop(self, frontier):
+        pass
+
+    def set_exporter(self, writer):
+        if not self._checkable:
+            raise ValueError('{0} does not support streaming export'.format(type(self).__name__))
+        self._exporter = writer
+        return self
+
+    def set_checkpoint(self, path, every=10000):
+        if not self._checkpointable:
+            raise ValueError('{0} does not support checkpoints'.format(type(self).__name__))
+        if every < 1:
+            raise ValueError('checkpoint interval must be at least 1: {0}'.format(every))
+        self.checkpoint_path = path
+        self.checkpoint_every = every
+        return self
+
+    def explore(self, process_list, s0, report=True):
+        self._prepare(process_list, s0)
+        s0 = self._canonical(s0)
+        if self.checkpoint_path != None and (s0.shared_vars.key() == None or s0.shared_vars.restore(s0.shared_vars.key()) == None):
+            raise ValueError('checkpointing needs SharedVars.key() and SharedVars.restore()')
+
+        lts_tb = LtsTbl(s0)
+        if self.checkpoint_path != None:
+            _begin_checkpoint(self.checkpoint_path, self, lts_tb)
+        if self._monitor != None and self._monitor.invariant(lts_tb, s0):
+            if self._exporter != None:
+                self._exporter.node(0, s0.to_graph_str(0), lts_tb._color(0))
+            return lts_tb
+        return self._search(lts_tb, [ 0 ], deque([ 0 ]), report)
+
+    def check(self, process_list, s0, invariant=None, deadlock=True, stop_on_first=True, max_violations=None):
+        if not self._checkable:
+            raise ValueError('{0} does not support check mode'.format(type(self).__name__))
+        if self.por and invariant != None:
+            raise ValueError('invariant checking is not supported with por')
+
+        limit = max_violations if max_violations != None else (1 if stop_on_first else None)
+        self._monitor = _Monitor(invariant, deadlock, limit)
+        try:
+            lts_tb = self.explore(process_list, s0, False)
+        finally:
+            monitor, self._monitor = self._monitor, None
+        return CheckResult(lts_tb, monitor.violations, not monitor.stopped and not lts_tb._unexplored)
+
+    def _prepare(self, process_list, s0):
+        self._safe = {}
+        self._expanded = set()
+        self._saved = (0, 0)
+        self._dirty = set()
+        self._groups = _symmetry_groups(process_list, s0.shared_vars, self.symmetry)
+
+    def _search(self, lts_tb, depth, frontier, report):
+        try:
+            return self._search_loop(lts_tb, depth, frontier, report)
+        finally:
+            if self._exporter != None:
+                for idx in sorted(lts_tb._unexplored | set(frontier)):
+                    self._exporter.node(idx, lts_tb.state(idx).to_graph_str(idx), lts_tb._color(idx))
+
+    def _search_loop(self, lts_tb, depth, frontier, report):
+        count = 0
+        while frontier:
+            count += 1
+            if self.checkpoint_path != None and count % self.checkpoint_every == 0:
+                _save_checkpoint(self.checkpoint_path, self, lts_tb, depth, frontier)
+
+            idx = self._pop(frontier)
+            d = depth[idx]
+            if self.max_depth != None and self.max_depth <= d:
+                lts_tb._unexplored.add(idx)
+                self._touch(idx)
+                continue
+
+            again = idx in self._expanded
+            if self.max_depth != None:
+                self._expanded.add(idx)
+                self._touch(idx)
+
+            s = lts_tb.state(idx)
+            for i, p, tran, t in self._expand(lts_tb, s):
+                k = lts_tb._key(t)
+                j = lts_tb._key_to_id.get(k)
+                if again and j != None:
+                    self._deepen(lts_tb, depth, frontier, j, d + 1, (idx, p, tran))
+                    continue
+
+                is_new = j == None
+                if is_new:
+                    j = lts_tb._insert(k, idx, p, tran)
+                lts_tb._add_edge(idx, j, p, tran)
+                if self._exporter != None:
+                    self._exporter.edge(idx, j, _action_label(p, tran))
+                if is_new:
+                    depth.append(d + 1)
+                    frontier.append(j)
+                    if self._monitor != None and self._monitor.invariant(lts_tb, t):
+                        return lts_tb
+                    continue
+                self._deepen(lts_tb, depth, frontier, j, d + 1, (idx, p, tran))
+
+            if again:
+                continue
+            if self._exporter != None:
+                self._exporter.node(idx, s.to_graph_str(idx), lts_tb._color(idx))
+            if report and not lts_tb._live[idx]:
+                lts_tb._path(idx).print()
+            if self._monitor != None and not lts_tb._live[idx] and self._monitor.deadlock(lts_tb, s):
+                return lts_tb
+
+        return lts_tb
+
+    def _deepen(self, lts_tb, depth, frontier, j, d, parent):
+        # a shorter path to an expanded state must be pushed through its descendants again
+        if self.max_depth != None and d < depth[j]:
+            depth[j] = d
+            lts_tb._set_parent(j, *parent)
+            lts_tb._unexplored.discard(j)
+            frontier.append(j)
+            self._touch(j)
+
+    def _touch(self, idx):
+        # states written by an earlier checkpoint whose depth, parent or flags changed since
+        if self.checkpoint_path != None:
+            self._dirty.add(idx)
+
+    def _expand(self, lts_tb, s):
+        enabled = s.successors()
+        if self.por:
+            for i in sorted(set([ e[0] for e in enabled ])):
+                if not self._is_safe(s, i):
+                    continue
+                ample = [ (j, p, tran, self._canonical(s.successor(j, tran))) for j, p, tran in enabled if j == i ]
+                if all([ lts_tb.id_of(t) == None for _, _, _, t in ample ]):
+                    return ample
+        return [ (i, p, tran, self._canonical(s.successor(i, tran))) for i, p, tran in enabled ]
+
+    def _canonical(self, s):
+        return _canonical_state(s, self._groups)
+
+    def _is_safe(self, s, i):
+        k = (i, s.locs[i])
+        if k not in self._safe:
+            p = s.p_list[i]
+            mine = [ _footprint(i, p, tran) for tran in p.trans_at(s.locs[i]) ]
+            others = [ _footprint(j, q, tran) for j, q in enumerate(s.p_list) if j != i for st in q.state_trans for tran in st.transitions ]
+            self._safe[k] = all([ _is_independent(a, b) for a in mine for b in others ])
+        return self._safe[k]
+
+class Violation:
+    def __init__(self, kind, state, path):
+        self.kind = kind
+        self.state = state
+        self.path = path
+
+    def print(self):
+        print('{0}: {1}'.format(self.kind, self.state.to_str()))
+        self.path.print()
+
+class CheckResult:
+    def __init__(self, lts_tbl, violations, complete):
+        self.lts_tbl = lts_tbl
+        self.violations = violations
+        self.complete = complete
+
+    def print(self):
+        for v in self.violations:
+            v.print()
+
+class _Monitor:
+    def __init__(self, invariant, deadlock, limit):
+        if invariant != None and not callable(invariant):
+            formula = invariant
+            invariant = lambda s: formula.exec(s.shared_vars, [])
+        self._invariant = invariant
+        self._deadlock = deadlock
+        self._limit = limit
+        self.clear()
+
+    def clear(self):
+        self.violations = []
+        self.stopped = False
+        self._seen = set()
+
+    def invariant(self, lts_tb, s):
+        if self._invariant == None or self._invariant(s):
+            return False
+        return self._report(lts_tb, 'invariant', s)
+
+    def deadlock(self, lts_tb, s):
+        if not self._deadlock:
+            return False
+        return self._report(lts_tb, 'deadlock', s)
+
+    def _report(self, lts_tb, kind, s):
+        if (kind, s) not in self._seen:
+            self._seen.add((kind, s))
+            self.violations.append(Violation(kind, s, lts_tb.path(s)))
+        self.stopped = self._limit != None and self._limit <= len(self.violations)
+        return self.stopped
+
+def _trans_shape(p):
+    return [ (st.location, st.transitions) for st in p.state_trans ]
+
+# the reduction is only sound for genuinely interchangeable processes: the group must run the
+# very same Transition objects, and guards, actions and SharedVars.permute() must not depend on
+# process identity; e.g. a signal that wakes the first waiter in cond dict order breaks symmetry
+def _symmetry_groups(process_list, r0, groups):
+    if not groups:
+        return []
+
+    for g in groups:
+        if any([ _trans_shape(p) != _trans_shape(g[0]) for p in g ]):
+            raise ValueError('processes in a symmetry group must share the same Transition objects: {0}'.format( \
+                ', '.join([ p.name for p in g ])))
+    key = r0.key()
+    if key == None or r0.permute(key, list(range(len(process_list)))) == None or r0.process_key(key, 0) == None:
+        raise ValueError('symmetry reduction needs SharedVars.key(), restore(), permute() and process_key()')
+    return [ [ process_list.index(p) for p in g ] for g in groups ]
+
+def _canonical_state(s, groups):
+    # sorting each group by its processes' location and per-process data picks one state of the orbit
+    if not groups:
+        return s
+
+    r = s.shared_vars
+    key = r.key()
+    perm = list(range(len(s.locs)))
+    for g in groups:
+        for dst, src in zip(g, sorted(g, key=lambda i: (s.locs[i], r.process_key(key, i)))):
+            perm[dst] = src
+    if all([ i == j for i, j in enumerate(perm) ]):
+        return s
+    return State.restore(s.p_list, r, (tuple([ s.locs[j] for j in perm ]), r.permute(key, perm)))
+
+def _resolve(names, pid):
+    return set([ (n[0], pid) if isinstance(n, tuple) and n[1] == 'pid' else n for n in names ])
+
+def _footprint(pid, process, tran):
+    reads = [ tran.guard.reads(process), tran.action.reads(process) ]
+    writes = tran.action.writes(process)
+    if None in reads or writes == None:
+        return None
+    return (_resolve(reads[0], pid) | _resolve(reads[1], pid), _resolve(writes, pid))
+
+def _overlaps(a, b):
+    # a whole variable overlaps each of its elements
+    return bool(a & b) or any([ isinstance(n, tuple) and n[0] in b for n in a ]) \
+        or any([ isinstance(n, tuple) and n[0] in a for n in b ])
+
+def _is_independent(a, b):
+    if a == None or b == None:
+        return False
+    return not _overlaps(a[1], b[0] | b[1]) and not _overlaps(b[1], a[0])
+
+class Bfs(SearchStrategy):
+    def _pop(self, frontier):
+        return frontier.popleft()
+
+class Dfs(SearchStrategy):
+    def _pop(self, frontier):
+        return frontier.pop()
+
+class BoundedDfs(Dfs):
+    def __init__(self, max_depth, por=False, symmetry=None):
+        super().__init__(max_depth, por, symmetry)
+
+class IterativeDeepening(SearchStrategy):
+    _checkpointable = False
+
+    def __init__(self, max_depth=None, step=1, por=False, symmetry=None):
+        super().__init__(max_depth, por, symmetry)
+        self.step = step
+
+    def _pop(self, frontier):
+        return frontier.pop()
+
+    def explore(self, process_list, s0, report=True):
+        bound = self.step
+        while True:
+            inner = BoundedDfs(bound, self.por, self.symmetry)
+            if self._monitor != None:
+                self._monitor.clear()
+                inner._monitor = self._monitor
+            lts_tb = inner.explore(process_list, s0, False)
+            found = self._monitor.violations if self._monitor != None else lts_tb._deadlock_ids()
+            if found or not lts_tb._unexplored:
+                break
+            if self.max_depth != None and self.max_depth <= bound:
+                break
+            bound = bound + self.step if self.max_depth == None else min(bound + self.step, self.max_depth)
+
+        if self._exporter != None:
+            lts_tb.write(self._exporter)
+        if report:
+            for idx in lts_tb._deadlock_ids():
+                lts_tb._path(idx).print()
+        return lts_tb
+
+def _flat_trans(p):
+    return [ t for st in p.state_trans for t in st.transitions ]
+
+def _write_chunk(f, data):
+    blob = zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    f.write(struct.pack('<q', len(blob)))
+    f.write(blob)
+
+def _read_chunks(path):
+    chunks = []
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                break
+            n, = struct.unpack('<q', head)
+            blob = f.read(n)
+            if len(blob) < n:
+                break
+            chunks.append(pickle.loads(zlib.decompress(blob)))
+            size = f.tell()
+    return chunks, size
+
+def _runs(ids):
+    res = []
+    for v in ids:
+        if res and res[-1][0] + res[-1][1] == v:
+            res[-1][1] += 1
+        else:
+            res.append([ v, 1 ])
+    return res
+
+def _begin_checkpoint(path, strategy, lts_tb):
+    who = lts_tb._who_of
+    groups = [ [ who[p] for p in g ] for g in strategy.symmetry ] if strategy.symmetry else None
+    with open(path, 'wb') as f:
+        _write_chunk(f, { 'strategy': (type(strategy).__name__, strategy.max_depth, strategy.por, groups, strategy.checkpoint_every) })
+
+def _save_checkpoint(path, strategy, lts_tb, depth, frontier):
+    # each checkpoint appends only the states, edges and updates since the previous one
+    n, e = strategy._saved
+    ids = sorted([ idx for idx in strategy._dirty if idx < n ]) + list(range(n, len(lts_tb)))
+    data = {
+        'fps': [ lts_tb._fp(idx) for idx in range(n, len(lts_tb)) ],
+        'ids': array('q', ids).tobytes(),
+        'rows': [ array('q', [ a[idx] for idx in ids ]).tobytes() for a in (depth, lts_tb._prev, lts_tb._pwho, lts_tb._ptran) ],
+        'flags': bytes([ (idx in lts_tb._unexplored) | ((idx in strategy._expanded) << 1) for idx in ids ]),
+        'edges': [ a[e:].tobytes() for a in (lts_tb._src, lts_tb._dst, lts_tb._who, lts_tb._tran) ],
+        'frontier': _runs(frontier),
+    }
+    with open(path, 'ab') as f:
+        _write_chunk(f, data)
+    strategy._saved = (len(lts_tb), len(lts_tb._src))
+    strategy._dirty = set()
+
+def resume(path, process_list, r0, report=True):
+    chunks, size = _read_chunks(path)
+    if len(chunks) < 2:
+        raise ValueError('{0}: no checkpoint to resume from'.format(path))
+    # a chunk cut short by a crash is dropped; the search appends after the last complete one
+    os.truncate(path, size)
+
+    name, max_depth, por, groups, every = chunks[0]['strategy']
+    symmetry = [ [ process_list[i] for i in g ] for g in groups ] if groups else None
+    strategy = _resumable[name](max_depth, por, symmetry).set_checkpoint(path, every)
+
+    s0 = State.restore(process_list, r0, chunks[1]['fps'][0])
+    lts_tb = LtsTbl(s0)
+    lts_tb._id_to_key = []
+    lts_tb._prev, lts_tb._pwho, lts_tb._ptran = array('q'), array('q'), array('q')
+    depth = []
+    expanded = set()
+    for data in chunks[1:]:
+        lts_tb._id_to_key.extend([ lts_tb._pack(fp) for fp in data['fps'] ])
+        depth.extend([ 0 ] * len(data['fps']))
+        for a in (lts_tb._prev, lts_tb._pwho, lts_tb._ptran):
+            a.extend([ -1 ] * len(data['fps']))
+        rows = [ array('q', b) for b in data['rows'] ]
+        for k, idx in enumerate(array('q', data['ids'])):
+            depth[idx], lts_tb._prev[idx], lts_tb._pwho[idx], lts_tb._ptran[idx] = [ r[k] for r in rows ]
+            flags = data['flags'][k]
+            if flags & 1:
+                lts_tb._unexplored.add(idx)
+            else:
+                lts_tb._unexplored.discard(idx)
+            if flags & 2:
+                expanded.add(idx)
+        for a, b in zip((lts_tb._src, lts_tb._dst, lts_tb._who, lts_tb._tran), data['edges']):
+            a.frombytes(b)
+    lts_tb._reindex()
+
+    strategy._prepare(process_list, s0)
+    strategy._expanded = expanded
+    strategy._saved = (len(lts_tb), len(lts_tb._src))
+    frontier = [ v for start, n in chunks[-1]['frontier'] for v in range(start, start + n) ]
+    return strategy._search(lts_tb, depth, deque(frontier), report)
+
+class BatchSearch(metaclass=ABCMeta):
+    # engines that run their own level-by-level search instead of SearchStrategy's frontier loop
+    @abstractmethod
+    def explore(self, process_list, s0, report=True):
+        pass
+
+    def check(self, process_list, s0, invariant=None, deadlock=True, stop_on_first=True, max_violations=None):
+        raise ValueError('{0} does not support check mode'.format(type(self).__name__))
+
+    def set_exporter(self, writer):
+        raise ValueError('{0} does not support streaming export'.format(type(self).__name__))
+
+    def set_checkpoint(self, path, every=10000):
+        raise ValueError('{0} does not support checkpoints'.format(type(self).__name__))
+
+class ParallelBfs(BatchSearch):
+    # each worker owns the states whose fingerprint hashes to its shard; workers hand successors
+    # straight to their owner's inbox and translate their own tables to global ids, so the
+    # parent only lays out the levels and splices the shards together
+    def __init__(self, workers=None):
+        self.workers = workers if workers != None else os.cpu_count()
+
+    def explore(self, process_list, s0, report=True):
+        r0 = s0.shared_vars
+        if r0.key() == None or r0.restore(r0.key()) == None:
+            raise ValueError('ParallelBfs needs SharedVars.key() and SharedVars.restore()')
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise ValueError('ParallelBfs needs the fork start method, which this platform does not provide')
+
+        ctx = multiprocessing.get_context('fork')
+        inboxes = [ ctx.Queue() for _ in range(self.workers) ]
+        conns = []
+        workers = []
+        try:
+            for shard in range(self.workers):
+                parent_conn, child_conn = ctx.Pipe()
+                w = ctx.Process(target=_parallel_worker, args=(child_conn, shard, inboxes, process_list, s0), daemon=True)
+                w.start()
+                child_conn.close()
+                conns.append(parent_conn)
+                workers.append(w)
+
+            starts = _gather(conns)
+            bases = self._layout(starts)
+            for c in conns:
+                c.send((starts, bases))
+            tables = _gather(conns)
+        finally:
+            for w in workers:
+                if w.is_alive():
+                    w.terminate()
+                w.join()
+
+        lts_tb = self._merge(s0, starts, tables)
+        if report:
+            for idx in lts_tb._deadlock_ids():
+                lts_tb._path(idx).print()
+        return lts_tb
+
+    def _layout(self, starts):
+        # states are numbered level by level, and within a level shard by shard
+        bases = [ array('q') for _ in starts ]
+        n = 0
+        for level in range(len(starts[0])):
+            for shard, st in enumerate(starts):
+                bases[shard].append(n)
+                n += st[level + 1] - st[level] if level + 1 < len(st) else 0
+        return bases
+
+    def _merge(self, s0, starts, tables):
+        lts_tb = LtsTbl(s0)
+        lts_tb._id_to_key = []
+        lts_tb._prev, lts_tb._pwho, lts_tb._ptran = array('q'), array('q'), array('q')
+        for level in range(len(starts[0]) - 1):
+            for st, t in zip(starts, tables):
+                a, b = st[level], st[level + 1]
+                lts_tb._id_to_key.extend(t[0][a:b])
+                lts_tb._prev.extend(t[1][a:b])
+                lts_tb._pwho.extend(t[2][a:b])
+                lts_tb._ptran.extend(t[3][a:b])
+        for t in tables:
+            lts_tb._src.extend(t[4])
+            lts_tb._dst.extend(t[5])
+            lts_tb._who.extend(t[6])
+            lts_tb._tran.extend(t[7])
+        lts_tb._reindex()
+        return lts_tb
+
+def _shard_of(fp, n):
+    # forked workers share the parent's hash seed, so every process agrees on the owner
+    return hash(fp) % n
+
+def _reply(conn):
+    msg = conn.recv()
+    if isinstance(msg, BaseException):
+        raise msg
+    return msg
+
+def _gather(conns):
+    # a failing worker leaves its peers waiting on their inboxes, so listen to every worker at once
+    res = [ None ] * len(conns)
+    pending = list(conns)
+    while pending:
+        for c in multiprocessing.connection.wait(pending):
+            res[conns.index(c)] = _reply(c)
+            pending.remove(c)
+    return res
+
+def _parallel_worker(conn, shard, inboxes, process_list, s0):
+    try:
+        _parallel_shard(conn, shard, inboxes, process_list, s0)
+    except Exception as e:
+        conn.send(e)
+
+def _parallel_shard(conn, shard, inboxes, process_list, s0):
+    n = len(inboxes)
+    codes = [ { t:j for j, t in enumerate(_flat_trans(p)) } for p in process_list ]
+    r0 = s0.shared_vars
+    seen = {}
+    fps = []
+    starts = array('q')
+    prev_shard, prev_local, pwho, ptran = array('q'), array('q'), array('q'), array('q')
+    src_shard, src_local, dst, who, tran = array('q'), array('q'), array('q'), array('q'), array('q')
+    fp = s0.fingerprint()
+    batches = [ [ (-1, -1, -1, fp) ] if _shard_of(fp, n) == shard else [] ] + [ [] ] * (n - 1)
+    early = []
+    level = 0
+    while True:
+        starts.append(len(fps))
+        for sender, batch in enumerate(batches):
+            for local, i, j, fp in batch:
+                v = seen.get(fp)
+                if v == None:
+                    v = len(fps)
+                    seen[fp] = v
+                    fps.append(fp)
+                    prev_shard.append(sender)
+                    prev_local.append(local)
+                    pwho.append(i)
+                    ptran.append(j)
+                if local != -1:
+                    src_shard.append(sender)
+                    src_local.append(local)
+                    dst.append(v)
+                    who.append(i)
+                    tran.append(j)
+
+        out = [ [] for _ in range(n) ]
+        for v in range(starts[-1], len(fps)):
+            s = State.restore(process_list, r0, fps[v])
+            for i, p, t in s.successors():
+                fp = s.successor(i, t).fingerprint()
+                out[_shard_of(fp, n)].append((v, i, codes[i][t], fp))
+        for k in range(n):
+            if k != shard:
+                inboxes[k].put((level, shard, len(fps) - starts[-1], pickle.dumps(out[k], protocol=pickle.HIGHEST_PROTOCOL) if out[k] else None))
+
+        # a peer may already be one level ahead; keep its batch for the next round
+        batches = [ [] for _ in range(n) ]
+        batches[shard] = out[shard]
+        msgs, early = early, []
+        while len(msgs) < n - 1:
+            msg = inboxes[shard].get()
+            (msgs if msg[0] == level else early).append(msg)
+        expanded = len(fps) - starts[-1]
+        for _, sender, count, blob in msgs:
+            batches[sender] = pickle.loads(blob) if blob != None else []
+            expanded += count
+        if expanded == 0:
+            break
+        level += 1
+
+    conn.send(starts)
+    starts, bases = conn.recv()
+    pack = LtsTbl(s0)._pack
+    keys = [ pack(fp) for fp in fps ]
+    prev = array('q', [ -1 if v == -1 else _global_id(starts, bases, k, v) for k, v in zip(prev_shard, prev_local) ])
+    src = array('q', [ _global_id(starts, bases, k, v) for k, v in zip(src_shard, src_local) ])
+    dst = array('q', [ _global_id(starts, bases, shard, v) for v in dst ])
+    conn.send((keys, prev, pwho, ptran, src, dst, who, tran))
+
+def _global_id(starts, bases, shard, local):
+    level = bisect.bisect_right(starts[shard], local) - 1
+    return bases[shard][level] + local - starts[shard][level]
+
+class BitStore:
+    def __init__(self, mem_bytes, hashes=3):
+        self._bits = bytearray(mem_bytes)
+        self._m = mem_bytes * 8
+        self._k = hashes
+        self._n = 0
+        self.omitted = 0.0
+
+    def _indexes(self, key):
+        h1 = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h2 = hash((h1, 1)) | 1
+        return [ (h1 + i * h2) % self._m for i in range(self._k) ]
+
+    def id_of(self, key):
+        idx = self._indexes(key)
+        for i in idx:
+            if not self._bits[i >> 3] & (1 << (i & 7)):
+                return None
+        return idx[0]
+
+    def find(self, key):
+        return None if self.id_of(key) == None else key
+
+    def add(self, key):
+        ret = False
+        for i in self._indexes(key):
+            if not self._bits[i >> 3] & (1 << (i & 7)):
+                self._bits[i >> 3] |= 1 << (i & 7)
+                ret = True
+        if ret:
+            self.omitted += self.miss_probability()
+            self._n += 1
+        return ret
+
+    def miss_probability(self):
+        return (1.0 - math.exp(-self._k * self._n / self._m)) ** self._k
+
+class HashCompactStore:
+    def __init__(self, mem_bytes):
+        self._slots = array('Q', bytes(max(8, mem_bytes - mem_bytes % 8)))
+        self._n = 0
+        self.omitted = 0.0
+        self.is_full = False
+
+    def _probe(self, key):
+        h = (hash(key) & 0xFFFFFFFFFFFFFFFF) or 1
+        i = h % len(self._slots)
+        while self._slots[i] != 0 and self._slots[i] != h:
+            i = (i + 1) % len(self._slots)
+        return i, h
+
+    def id_of(self, key):
+        if self.is_full:
+            return (hash(key) & 0xFFFFFFFFFFFFFFFF) or 1
+        i, h = self._probe(key)
+        return h if self._slots[i] == h else None
+
+    def find(self, key):
+        return None if self.id_of(key) == None else key
+
+    def add(self, key):
+        if self.is_full:
+            return False
+        i, h = self._probe(key)
+        if self._slots[i] == h:
+            return False
+
+        self.omitted += self._n / 2.0 ** 64
+        self._slots[i] = h
+        self._n += 1
+        self.is_full = len(self._slots) <= self._n
+        return True
+
+    def miss_probability(self):
+        if self.is_full:
+            return 1.0
+        return 1.0 - math.exp(-self._n * (self._n - 1) / 2.0 ** 65)
+
+class ApproxResult:
+    def __init__(self, store):
+        self.states = 1
+        self.transitions = 0
+        self.deadlocks = []
+        self.store = store
+
+    def print(self):
+        print('states={0} transitions={1} deadlocks={2}'.format(self.states, self.transitions, len(self.deadlocks)))
+        print('p(miss)={0:.3g} expected omissions={1:.3g}'.format(self.store.miss_probability(), self.store.omitted))
+
+class Bitstate(SearchStrategy):
+    _checkable = False
+    _checkpointable = False
+
+    def __init__(self, mem_bytes=2 ** 24, hashes=3, por=False, symmetry=None):
+        super().__init__(None, por, symmetry)
+        self.mem_bytes = mem_bytes
+        self.hashes = hashes
+
+    def _pop(self, frontier):
+        return frontier.pop()
+
+    def _store(self):
+        return BitStore(self.mem_bytes, self.hashes)
+
+    def explore(self, process_list, s0, report=True):
+        if s0.shared_vars.key() == None:
+            raise ValueError('{0} needs SharedVars.key()'.format(type(self).__name__))
+
+        self._safe = {}
+        self._groups = _symmetry_groups(process_list, s0.shared_vars, self.symmetry)
+        s0 = self._canonical(s0)
+
+        res = ApproxResult(self._store())
+        res.store.add(s0)
+        stack = [ (s0, None, None, iter(self._expand(res.store, s0))) ]
+        self._check_deadlock(res, stack, report)
+
+        while stack:
+            succ = next(stack[-1][3], None)
+            if succ == None:
+                stack.pop()
+                continue
+
+            i, p, tran, t = succ
+            res.transitions += 1
+            if res.store.add(t):
+                res.states += 1
+                stack.append((t, p, tran, iter(self._expand(res.store, t))))
+                self._check_deadlock(res, stack, report)
+
+        if report:
+            res.print()
+        return res
+
+    def _check_deadlock(self, res, stack, report):
+        s = stack[-1][0]
+        if s.successors():
+            return
+
+        path = Path(stack[0][0])
+        for t, p, tran, _ in stack[1:]:
+            path._add(t, tran, p)
+        res.deadlocks.append(path)
+        if report:
+            path.print()
+
+class HashCompact(Bitstate):
+    def __init__(self, mem_bytes=2 ** 24, por=False, symmetry=None):
+        super().__init__(mem_bytes, 1, por, symmetry)
+
+    def _store(self):
+        return HashCompactStore(self.mem_bytes)
+
+class DiskStateStore:
+    _index_fmt = '<QqII'
+
+    def __init__(self, directory):
+        self._data = open(os.path.join(directory, 'states.dat'), 'w+b')
+        self._index = open(os.path.join(directory, 'index.dat'), 'w+b')
+        self._maps = None
+        self._size = struct.calcsize(self._index_fmt)
+        self.count = 0
+
+    def append(self, data, parent, who, tran):
+        offset = self._data.seek(0, os.SEEK_END)
+        self._data.write(struct.pack('<I', len(data)))
+        self._data.write(data)
+        self._index.seek(0, os.SEEK_END)
+        self._index.write(struct.pack(self._index_fmt, offset, parent, who, tran))
+        self.count += 1
+        return self.count - 1
+
+    def get(self, sid):
+        if self._maps == None or len(self._maps[1]) < (sid + 1) * self._size:
+            self._unmap()
+            self._data.flush()
+            self._index.flush()
+            self._maps = (mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ),
+                          mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ))
+        data, index = self._maps
+        offset, parent, who, tran = struct.unpack_from(self._index_fmt, index, sid * self._size)
+        n, = struct.unpack_from('<I', data, offset)
+        return data[offset + 4:offset + 4 + n], parent, who, tran
+
+    def _unmap(self):
+        if self._maps != None:
+            for m in self._maps:
+                m.close()
+            self._maps = None
+
+    def close(self):
+        self._unmap()
+        self._data.close()
+        self._index.close()
+
+def _remove_store(store, directory):
+    store.close()
+    if directory != None:
+        shutil.rmtree(directory, ignore_errors=True)
+
+class DiskResult:
+    def __init__(self, store, process_list, r0, directory=None):
+        self.states = 1
+        self.transitions = 0
+        self.deadlocks = []
+        self.store = store
+        self._p_list = process_list
+        self._r0 = r0
+        self._finalizer = weakref.finalize(self, _remove_store, store, directory)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._finalizer()
+
+    def state(self, sid):
+        return State.restore(self._p_list, self._r0, _decode(self.store.get(sid)[0]))
+
+    def path(self, sid):
+        trace = []
+        while sid != -1:
+            data, parent, who, tran = self.store.get(sid)
+            trace.append((sid, parent, who, tran))
+            sid = parent
+
+        s = self.state(trace[-1][0])
+        path = Path(s)
+        for sid, parent, who, tran in reversed(trace[:-1]):
+            p = self._p_list[who]
+            t = self.state(sid)
+            path._add(t, p.trans_at(s.locs[who])[tran], p)
+            s = t
+        return path
+
+    def print(self):
+        print('states={0} transitions={1} deadlocks={2}'.format(self.states, self.transitions, len(self.deadlocks)))
+
+class DiskBfs(BatchSearch):
+    def __init__(self, directory=None, batch_size=100000, symmetry=None):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.symmetry = symmetry
+        self._groups = []
+
+    def explore(self, process_list, s0, report=True):
+        r0 = s0.shared_vars
+        if r0.key() == None or r0.restore(r0.key()) == None:
+            raise ValueError('DiskBfs needs SharedVars.key() and SharedVars.restore()')
+
+        self._groups = _symmetry_groups(process_list, r0, self.symmetry)
+        s0 = _canonical_state(s0, self._groups)
+
+        directory = self.directory if self.directory != None else tempfile.mkdtemp(prefix='ddsv')
+        os.makedirs(directory, exist_ok=True)
+        res = DiskResult(DiskStateStore(directory), process_list, r0, None if self.directory != None else directory)
+        try:
+            self._explore(res, directory, s0, report)
+        except BaseException:
+            res.close()
+            raise
+        return res
+
+    def _explore(self, res, directory, s0, report):
+        data = _encode(s0.fingerprint())
+        sid = res.store.append(data, -1, 0, 0)
+        visited = os.path.join(directory, 'visited')
+        frontier = os.path.join(directory, 'frontier')
+        with open(visited, 'wb') as f:
+            _write_record(f, data)
+        with open(frontier, 'wb') as f:
+            _write_record(f, data, sid)
+
+        level = 0
+        while os.path.getsize(frontier):
+            runs = self._expand_level(res, frontier, directory, level, report)
+            self._merge_level(res, runs, visited, frontier)
+            for r in runs:
+                os.remove(r)
+            level += 1
+
+        os.remove(frontier)
+        if report:
+            res.print()
+
+    def _expand_level(self, res, frontier, directory, level, report):
+        runs = []
+        buf = []
+        for data, sid in _read_records(frontier, '<q'):
+            s = State.restore(res._p_list, res._r0, _decode(data))
+            n = 0
+            for i, p in enumerate(res._p_list):
+                for j, tran in enumerate(p.trans_at(s.locs[i])):
+                    if tran.guard.test(i, p, s):
+                        t = _canonical_state(s.successor(i, tran), self._groups)
+                        buf.append((_encode(t.fingerprint()), sid, i, j))
+                        n += 1
+
+            res.transitions += n
+            if n == 0:
+                res.deadlocks.append(sid)
+                if report:
+                    res.path(sid).print()
+
+            if self.batch_size <= len(buf):
+                runs.append(_spill(buf, os.path.join(directory, 'run.{0}.{1}'.format(level, len(runs)))))
+                buf = []
+
+        if buf:
+            runs.append(_spill(buf, os.path.join(directory, 'run.{0}.{1}'.format(level, len(runs)))))
+        return runs
+
+    def _merge_level(self, res, runs, visited, frontier):
+        old = _read_records(visited, '')
+        v = next(old, None)
+        last = None
+        with open(visited + '.new', 'wb') as fv, open(frontier, 'wb') as ff:
+            for data, parent, who, tran in heapq.merge(*[ _read_records(r, '<qII') for r in runs ]):
+                if data == last:
+                    continue
+                last = data
+
+                while v != None and v[0] < data:
+                    _write_record(fv, v[0])
+                    v = next(old, None)
+                if v != None and v[0] == data:
+                    continue
+
+                sid = res.store.append(data, parent, who, tran)
+                res.states += 1
+                _write_record(fv, data)
+                _write_record(ff, data, sid)
+
+            while v != None:
+                _write_record(fv, v[0])
+                v = next(old, None)
+        os.replace(visited + '.new', visited)
+
+def _encode(fp):
+    return repr(fp).encode()
+
+def _decode(data):
+    return ast.literal_eval(data.decode())
+
+def _write_record(f, data, *nums):
+    f.write(struct.pack('<I', len(data)))
+    f.write(data)
+    if nums:
+        f.write(struct.pack('<q' if len(nums) == 1 else '<qII', *nums))
+
+def _read_records(path, fmt):
+    size = struct.calcsize(fmt) if fmt else 0
+    with open(path, 'rb') as f:
+        while True:
+            head = f.read(4)
+            if not head:
+                break
+            n, = struct.unpack('<I', head)
+            data = f.read(n)
+            yield (data,) + (struct.unpack(fmt, f.read(size)) if fmt else ())
+
+def _spill(buf, path):
+    buf.sort()
+    with open(path, 'wb') as f:
+        for data, parent, who, tran in buf:
+            _write_record(f, data, parent, who, tran)
+    return path
+
+class NumpyResult:
+    def __init__(self, process_list, r0):
+        self.deadlocks = []
+        self._p_list = process_list
+        self._r0 = r0
+        self._chunks = { 'rows': [], 'parent': [], 'src': [], 'dst': [], 'who': [], 'tran': [] }
+        self._flat = {}
+
+    def _append(self, **arrays):
+        for k, v in arrays.items():
+            self._chunks[k].append(v)
+        self._flat = {}
+
+    def __getattr__(self, name):
+        chunks = self.__dict__.get('_chunks')
+        if chunks == None or name not in chunks:
+            raise AttributeError(name)
+        if name not in self._flat:
+            self._flat[name] = np.concatenate(chunks[name]) if chunks[name] else np.zeros((0,), np.int64)
+        return self._flat[name]
+
+    @property
+    def states(self):
+        return len(self.rows)
+
+    @property
+    def transitions(self):
+        return len(self.src)
+
+    def state(self, sid):
+        n = len(self._p_list)
+        row = self.rows[sid]
+        schema = self._r0.schema
+        v = []
+        for f in schema.fields:
+            off = n + schema._offset[f.name]
+            vals = [ int(x) for x in row[off:off + (f.size if f.size != None else 1)] ]
+            v.extend([ bool(x) for x in vals ] if f.domain == bool else vals)
+        return State.restore(self._p_list, self._r0, (tuple([ int(x) for x in row[:n] ]), tuple(v)))
+
+    def path(self, sid):
+        trace = []
+        while sid != -1:
+            prev, who, tran = self.parent[sid]
+            trace.append((sid, who, tran))
+            sid = int(prev)
+
+        s = self.state(trace[-1][0])
+        path = Path(s)
+        for sid, who, tran in reversed(trace[:-1]):
+            p = self._p_list[who]
+            t = self.state(sid)
+            path._add(t, p.trans_at(s.locs[who])[tran], p)
+            s = t
+        return path
+
+    def to_lts_tbl(self):
+        states = [ self.state(i) for i in range(self.states) ]
+        lts_tb = LtsTbl(states[0])
+        for src, dst, who, tran in zip(self.src.tolist(), self.dst.tolist(), self.who.tolist(), self.tran.tolist()):
+            s = states[src]
+            p = self._p_list[who]
+            lts_tb.add(states[dst], s, p, p.trans_at(s.locs[who])[tran])
+        return lts_tb
+
+    def save_graph(self, name):
+        self.to_lts_tbl().save_graph(name)
+
+class NumpyBfs(BatchSearch):
+    def explore(self, process_list, s0, report=True):
+        if np == None:
+            raise ImportError('NumpyBfs needs numpy')
+        r0 = s0.shared_vars
+        if not isinstance(r0, PackedVars):
+            raise ValueError('NumpyBfs needs shared variables declared with ddsv.Schema')
+
+        n = len(process_list)
+        blocks = self._compile(process_list, r0.schema)
+        lo, mult = self._radix(process_list, r0.schema)
+
+        res = NumpyResult(process_list, r0)
+        frontier = np.array([ list(s0.locs) + [ int(x) for x in r0.v ] ], dtype=np.int64)
+        frontier_ids = np.zeros(1, np.int64)
+        visited = (frontier - lo) @ mult
+        visited_ids = np.zeros(1, np.int64)
+        res._append(rows=frontier, parent=np.array([ [ -1, 0, 0 ] ], np.int64))
+
+        while len(frontier):
+            parts = []
+            for i, locs in enumerate(blocks):
+                # rows grouped by location, so each guard only sees the rows it can fire on
+                by_loc = np.argsort(frontier[:, i], kind='stable')
+                counts = np.bincount(frontier[:, i], minlength=len(locs))
+                ends = np.cumsum(counts)
+                for l, trans in enumerate(locs):
+                    rows = by_loc[ends[l] - counts[l]:ends[l]]
+                    if not len(rows) or not trans:
+                        continue
+                    vars = frontier[rows, n:]
+                    for j, guard, action, target in trans:
+                        sel = rows
+                        if guard != None:
+                            sel = rows[np.broadcast_to(np.asarray(guard(None, vars)) != 0, rows.shape)]
+                        if len(sel):
+                            t = frontier[sel]
+                            t[:, i] = target
+                            if action != None:
+                                action(t[:, n:], frontier[sel, n:])
+                            parts.append((sel, np.full(len(sel), i), np.full(len(sel), j), t))
+
+            has_succ = np.zeros(len(frontier), bool)
+            if parts:
+                parent = np.concatenate([ e[0] for e in parts ])
+                order = np.argsort(parent, kind='stable')
+                parent = parent[order]
+                who = np.concatenate([ e[1] for e in parts ])[order]
+                tran = np.concatenate([ e[2] for e in parts ])[order]
+                succ = np.concatenate([ e[3] for e in parts ])[order]
+                has_succ[parent] = True
+
+                keys = (succ - lo) @ mult
+                uniq, first = np.unique(keys, return_index=True)
+                at = np.searchsorted(visited, uniq)
+                fresh = visited[np.minimum(at, len(visited) - 1)] != uniq
+                new_first = np.sort(first[fresh])
+                new_ids = np.arange(res.states, res.states + len(new_first))
+
+                # both sides are sorted, so the new keys are spliced in rather than re-sorting everything
+                visited = np.insert(visited, at[fresh], uniq[fresh])
+                visited_ids = np.insert(visited_ids, at[fresh], res.states + np.searchsorted(new_first, first[fresh]))
+
+                src = frontier_ids[parent]
+                dst = visited_ids[np.searchsorted(visited, keys)]
+                res._append(src=src, dst=dst, who=who, tran=tran, rows=succ[new_first],
+                            parent=np.stack([ src[new_first], who[new_first], tran[new_first] ], axis=1))
+                next_frontier = succ[new_first]
+            else:
+                new_ids = np.zeros(0, np.int64)
+                next_frontier = frontier[:0]
+
+            for sid in frontier_ids[~has_succ].tolist():
+                res.deadlocks.append(sid)
+                if report:
+                    res.path(sid).print()
+            frontier = next_frontier
+            frontier_ids = new_ids
+
+        return res
+
+    def _compile(self, process_list, schema):
+        blocks = []
+        for i, p in enumerate(process_list):
+            blocks.append([ [ (j, _vector_guard(schema, tran.guard, i), _vector_action(schema, tran.action, i), p._loc_ids[tran.location]) \
+                for j, tran in enumerate(trans if trans != None else []) ] for trans in p._trans ])
+        return blocks
+
+    def _radix(self, process_list, schema):
+        lo = [ 0 for p in process_list ]
+        size = [ len(p._loc_names) for p in process_list ]
+        for f in schema.fields:
+            k = f.size if f.size != None else 1
+            lo.extend([ 0 if f.domain == bool else f.domain.start ] * k)
+            size.extend([ 2 if f.domain == bool else len(f.domain) ] * k)
+
+        mult = []
+        total = 1
+        for x in size:
+            mult.append(total)
+            total *= x
+        if 2 ** 63 <= total:
+            raise ValueError('state vector does not fit into 63 bits')
+        return np.array(lo, np.int64), np.array(mult, np.int64)
+
+def _vector_guard(schema, guard, pid):
+    if isinstance(guard, GuardTrue):
+        return None
+    if isinstance(guard, ExprGuard):
+        return schema.compile_vector_guard(guard.expr, pid, 0)
+    raise ValueError('NumpyBfs cannot vectorize {0}'.format(type(guard).__name__))
+
+def _vector_action(schema, action, pid):
+    if isinstance(action, ActionNop):
+        return None
+    if isinstance(action, ExprAction):
+        return schema.compile_vector_action(action.assigns, pid, 0)
+    raise ValueError('NumpyBfs cannot vectorize {0}'.format(type(action).__name__))
+
+_resumable = { 'Bfs': Bfs, 'Dfs': Dfs, 'BoundedDfs': BoundedDfs }
+
+def concurrent_composition(process_list, r0, name, strategy=None):
+    if strategy == None:
+        strategy = Bfs()
+    s0 = State(r0, process_list)
+    lts_tbl = strategy.explore(process_list, s0)
+    return lts_tbl
+
+class _MemberView:
+    # what a member's guards and actions see of a composite state
+    __slots__ = ('p_list', 'shared_vars')
+
+    def __init__(self, p_list, shared_vars):
+        self.p_list = p_list
+        self.shared_vars = shared_vars
+
+    @property
+    def locs(self):
+        raise ValueError('guards and actions of a grouped process cannot read locations')
+
+class _MemberGuard(Guard):
+    def __init__(self, member, pid, guard, p_list):
+        self.member = member
+        self.pid = pid
+        self.guard = guard
+        self.p_list = p_list
+
+    def exec(self, process, state):
+        return self.test(None, process, state)
+
+    def test(self, idx, process, state):
+        if self.pid != None:
+            state = _MemberView(self.p_list, state.shared_vars)
+        return self.guard.test(self.pid, self.member, state)
+
+    def reads(self, process):
+        reads = self.guard.reads(self.member)
+        return reads if reads == None or self.pid == None else _resolve(reads, self.pid)
+
+class _MemberAction(Action):
+    def __init__(self, member, pid, action, p_list):
+        self.member = member
+        self.pid = pid
+        self.action = action
+        self.p_list = p_list
+
+    def exec(self, process, dest, src):
+        self.apply(None, process, dest, src)
+
+    def apply(self, idx, process, dest, src):
+        if self.pid == None:
+            self.action.apply(self.pid, self.member, dest, src)
+            return
+        view = _MemberView(self.p_list, dest.shared_vars)
+        self.action.apply(self.pid, self.member, view, _MemberView(self.p_list, src.shared_vars))
+        dest.shared_vars = view.shared_vars
+
+    def reads(self, process):
+        reads = self.action.reads(self.member)
+        return reads if reads == None or self.pid == None else _resolve(reads, self.pid)
+
+    def writes(self, process):
+        writes = self.action.writes(self.member)
+        return writes if writes == None or self.pid == None else _resolve(writes, self.pid)
+
+def _is_internal(p, tran):
+    return tran.guard.reads(p) == () and tran.action.reads(p) == () and tran.action.writes(p) == ()
+
+def _divergent_blocks(n, edges, block_of):
+    succ = [ [] for _ in range(n) ]
+    for s, a, t in edges:
+        succ[s].append((a, t))
+    res = set()
+    for comp in _inert_sccs(n, succ, block_of):
+        if 1 < len(comp) or (None, comp[0]) in succ[comp[0]]:
+            res.add(block_of[comp[0]])
+    return res
+
+def group(process_list, name=None, pids=None, branching=True, p_list=None):
+    if pids == None:
+        pids = range(len(process_list))
+    pids = list(pids)
+    if p_list == None:
+        p_list = process_list
+
+    root = tuple([ p.loc_id(p.state_trans[0].location) for p in process_list ])
+    ids = { root: 0 }
+    locs = [ root ]
+    edges = []
+    trans = []
+    idx = 0
+    while idx < len(locs):
+        loc = locs[idx]
+        for j, p in enumerate(process_list):
+            for tran in p.trans_at(loc[j]):
+                t = loc[:j] + (p._loc_ids[tran.location],) + loc[j + 1:]
+                if t not in ids:
+                    ids[t] = len(locs)
+                    locs.append(t)
+                edges.append((idx, None if _is_internal(p, tran) else (j, tran), ids[t]))
+                trans.append((j, tran))
+        idx += 1
+
+    if branching:
+        block_of = _branching_partition(len(locs), edges, [ 0 ] * len(locs))
+        # an inert tau cycle keeps a tau self-loop, otherwise the block would look like a deadlock
+        divergent = _divergent_blocks(len(locs), edges, block_of)
+    else:
+        block_of = _strong_partition(len(locs), edges, [ 0 ] * len(locs))
+        divergent = set()
+
+    names = {}
+    for i, loc in enumerate(locs):
+        if block_of[i] not in names:
+            names[block_of[i]] = ','.join([ p.loc_name(l) for p, l in zip(process_list, loc) ])
+
+    moves = {}
+    for (src, a, dst), (j, tran) in zip(edges, trans):
+        b, c = block_of[src], block_of[dst]
+        if (branching and a == None and b == c and b not in divergent) or (b, a, c) in moves:
+            continue
+        if a == None:
+            moves[(b, a, c)] = Transition('tau', names[c], GuardTrue(), ActionNop())
+        else:
+            p = process_list[j]
+            moves[(b, a, c)] = Transition('{0}.{1}'.format(p.name, tran.label), names[c], \
+                _MemberGuard(p, pids[j], tran.guard, p_list), _MemberAction(p, pids[j], tran.action, p_list))
+
+    state_trans = { b: [] for b in names }
+    for (b, _, _), tran in moves.items():
+        state_trans[b].append(tran)
+
+    if name == None:
+        name = ''.join([ p.name for p in process_list ])
+    return Process(name, [ StateTransition(names[b], state_trans[b]) for b in names ])
+
+def compositional_composition(groups, r0, name, strategy=None, branching=True):
+    p_list = []
+
+    def build(item):
+        if isinstance(item, Process):
+            p_list.append(item)
+            return group([ item ], item.name, [ len(p_list) - 1 ], branching, p_list)
+        members = []
+        pids = []
+        for m in item:
+            if isinstance(m, Process):
+                p_list.append(m)
+                members.append(m)
+                pids.append(len(p_list) - 1)
+            else:
+                members.append(build(m))
+                pids.append(None)
+        return group(members, None, pids, branching, p_list)
+
+    process_list = [ build(g) for g in groups ]
+    return concurrent_composition(process_list, r0, name, strategy)
+
+def check(process_list, r0, invariant=None, deadlock=True, stop_on_first=True, max_violations=None, strategy=None):
+    if strategy == None:
+        strategy = Bfs()
+    s0 = State(r0, process_list)
+    return strategy.check(process_list, s0, invariant, deadlock, stop_on_first, max_violations)
+
+def bfs(process_list, s0):
+    return Bfs().explore(process_list, s0)
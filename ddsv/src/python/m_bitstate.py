@@ -0,0 +1,24 @@
+import ddsv
+import m_prod_cons3
+
+# m_prod_cons3.lts_tbl comes from the plain Bfs of concurrent_composition
+process_list = m_prod_cons3.process_list
+s0 = ddsv.State(m_prod_cons3.shared_vars, process_list)
+bfs_tbl = m_prod_cons3.lts_tbl
+
+print('Bfs:         states={0} transitions={1} deadlocks={2}'.format(len(bfs_tbl), len(bfs_tbl.edges()), len(bfs_tbl.deadlocks())))
+
+# the approximate modes keep no table, only the bits or hashes of the visited states; a store this
+# small is still large enough that no state is lost, so the counts match Bfs
+print('Bitstate:    ', end='')
+res = ddsv.Bitstate(mem_bytes=1024).explore(process_list, s0, False)
+res.print()
+
+print('HashCompact: ', end='')
+res = ddsv.HashCompact(mem_bytes=4096).explore(process_list, s0, False)
+res.print()
+
+# a store that is far too small silently drops states: p(miss) says how much to distrust the counts
+print('Bitstate:    ', end='')
+res = ddsv.Bitstate(mem_bytes=8).explore(process_list, s0, False)
+res.print()
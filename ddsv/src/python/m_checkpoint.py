@@ -0,0 +1,35 @@
+import os
+import tempfile
+
+import ddsv
+import m_prod_cons3
+
+# m_prod_cons3.lts_tbl comes from the plain Bfs of concurrent_composition
+process_list = m_prod_cons3.process_list
+shared_vars = m_prod_cons3.shared_vars
+bfs_tbl = m_prod_cons3.lts_tbl
+
+class Interrupt(ddsv.JsonLinesWriter):
+    # stands in for a long run that is killed halfway, e.g. by Ctrl-C
+    def __init__(self, budget):
+        super().__init__(os.devnull)
+        self.budget = budget
+
+    def node(self, idx, label, color=None):
+        if self.budget <= idx:
+            raise KeyboardInterrupt
+
+path = os.path.join(tempfile.mkdtemp(prefix='ddsv'), 'm_checkpoint.ckpt')
+try:
+    strategy = ddsv.Bfs().set_checkpoint(path, every=20)
+    strategy.set_exporter(Interrupt(50))
+    strategy.explore(process_list, ddsv.State(shared_vars, process_list), False)
+except KeyboardInterrupt:
+    print('interrupted after 50 states')
+
+lts_tbl = ddsv.resume(path, process_list, shared_vars, False)
+print('Bfs:     states={0} transitions={1} deadlocks={2}'.format(len(bfs_tbl), len(bfs_tbl.edges()), len(bfs_tbl.deadlocks())))
+print('resumed: states={0} transitions={1} deadlocks={2}'.format(len(lts_tbl), len(lts_tbl.edges()), len(lts_tbl.deadlocks())))
+print('same deadlocks: {0}'.format(sorted([ s.to_str() for s in lts_tbl.deadlocks() ]) == sorted([ s.to_str() for s in bfs_tbl.deadlocks() ])))
+os.remove(path)
+os.rmdir(os.path.dirname(path))
@@ -0,0 +1,18 @@
+import ddsv
+import m_depth
+import m_prod_cons3
+
+def summary(name, lts_tbl):
+    print('{0:14} states={1} transitions={2} deadlocks={3}'.format(name, len(lts_tbl), len(lts_tbl.edges()), \
+        sorted([ s.to_str() for s in lts_tbl.deadlocks() ])))
+
+# the producers are composed and minimized first, then combined with the consumer; every step
+# touches the shared variables, so nothing can be hidden and the result matches Bfs
+summary('Bfs', m_prod_cons3.lts_tbl)
+summary('[[P, Q], R]', ddsv.compositional_composition([[m_prod_cons3.P, m_prod_cons3.Q], m_prod_cons3.R], \
+    m_prod_cons3.shared_vars, 'm_compositional'))
+
+# m_depth only takes internal steps, which branching minimization folds away; what is left is a
+# single location that can only end up deadlocked
+summary('Bfs', ddsv.concurrent_composition([m_depth.P], m_depth.schema.vars(), 'm_compositional'))
+summary('[P]', ddsv.compositional_composition([m_depth.P], m_depth.schema.vars(), 'm_compositional'))
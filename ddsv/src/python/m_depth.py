@@ -0,0 +1,27 @@
+import ddsv
+
+schema = ddsv.Schema([])
+
+# E sits at depth 3 via A, but the depth-first search reaches D through B and C first
+p_state_trans_list = [
+    ddsv.StateTransition('0', [ddsv.Transition('a', 'A', ddsv.GuardTrue(), ddsv.ActionNop()),
+                               ddsv.Transition('b', 'B', ddsv.GuardTrue(), ddsv.ActionNop())]),
+    ddsv.StateTransition('A', [ddsv.Transition('d', 'D', ddsv.GuardTrue(), ddsv.ActionNop())]),
+    ddsv.StateTransition('B', [ddsv.Transition('c', 'C', ddsv.GuardTrue(), ddsv.ActionNop())]),
+    ddsv.StateTransition('C', [ddsv.Transition('d', 'D', ddsv.GuardTrue(), ddsv.ActionNop())]),
+    ddsv.StateTransition('D', [ddsv.Transition('e', 'E', ddsv.GuardTrue(), ddsv.ActionNop())]),
+    ddsv.StateTransition('E', [])
+]
+
+P = ddsv.Process('P', p_state_trans_list)
+
+P.save_graph('m_depth_P')
+
+lts_tbl = ddsv.concurrent_composition([P], schema.vars(), 'm_depth', ddsv.BoundedDfs(4))
+lts_tbl.save_graph('m_depth')
+
+result = ddsv.check([P], schema.vars(), strategy=ddsv.BoundedDfs(4))
+result.print()
+
+result = ddsv.check([P], schema.vars(), strategy=ddsv.IterativeDeepening(4))
+result.print()
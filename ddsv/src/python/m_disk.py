@@ -0,0 +1,18 @@
+import ddsv
+import m_prod_cons3
+
+# m_prod_cons3.lts_tbl comes from the plain Bfs of concurrent_composition
+process_list = m_prod_cons3.process_list
+bfs_tbl = m_prod_cons3.lts_tbl
+
+print('Bfs:     states={0} transitions={1} deadlocks={2}'.format(len(bfs_tbl), len(bfs_tbl.edges()), len(bfs_tbl.deadlocks())))
+
+# a tiny batch_size forces the frontier through several sorted runs on disk, as a state space
+# larger than memory would
+with ddsv.DiskBfs(batch_size=16).explore(process_list, ddsv.State(m_prod_cons3.shared_vars, process_list), False) as res:
+    print('DiskBfs: ', end='')
+    res.print()
+    print('same deadlocks: {0}'.format(sorted([ res.state(sid).to_str() for sid in res.deadlocks ]) == \
+        sorted([ s.to_str() for s in bfs_tbl.deadlocks() ])))
+    for sid in res.deadlocks:
+        res.path(sid).print()
@@ -0,0 +1,26 @@
+import json
+import os
+
+import ddsv
+import m_prod_cons3
+
+def count(path):
+    with open(path) as f:
+        lines = [ json.loads(line) for line in f ]
+    return len([ x for x in lines if 'node' in x ]), len([ x for x in lines if 'src' in x ])
+
+# m_prod_cons3.lts_tbl comes from the plain Bfs of concurrent_composition; export() writes it out
+# after the fact, without a pygraphviz layout
+lts_tbl = m_prod_cons3.lts_tbl
+print('Bfs:       states={0} transitions={1}'.format(len(lts_tbl), len(lts_tbl.edges())))
+for format in [ 'dot', 'graphml', 'jsonl' ]:
+    print('exported:  {0}'.format(lts_tbl.export('m_export', format)))
+print('jsonl:     nodes={0} edges={1}'.format(*count(os.path.join('img', 'm_export.jsonl'))))
+
+# an exporter streams nodes and edges while the search runs, so nothing has to wait for the end
+path = os.path.join('img', 'm_export_stream.jsonl')
+with ddsv.graph_writer(path) as w:
+    strategy = ddsv.Bfs()
+    strategy.set_exporter(w)
+    strategy.explore(m_prod_cons3.process_list, ddsv.State(m_prod_cons3.shared_vars, m_prod_cons3.process_list), False)
+print('streamed:  nodes={0} edges={1}'.format(*count(path)))
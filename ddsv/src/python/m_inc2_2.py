@@ -0,0 +1,37 @@
+import ddsv
+
+schema = ddsv.Schema([
+    ddsv.Var('mutex', bool),
+    ddsv.Var('x',  range(0, 3)),
+    ddsv.Var('t1', range(0, 3)),
+    ddsv.Var('t2', range(0, 3))
+])
+
+lock   = schema.guard('not mutex')
+
+p_state_trans_list = [
+    ddsv.StateTransition('0', [ddsv.Transition('lock',   '1', lock, schema.action({'mutex': 'True'}))]),
+    ddsv.StateTransition('1', [ddsv.Transition('read',   '2', ddsv.GuardTrue(), schema.action({'t1': 'x'}))]),
+    ddsv.StateTransition('2', [ddsv.Transition('inc',    '3', ddsv.GuardTrue(), schema.action({'t1': 't1 + 1'}))]),
+    ddsv.StateTransition('3', [ddsv.Transition('write',  '4', ddsv.GuardTrue(), schema.action({'x': 't1'}))]),
+    ddsv.StateTransition('4', [ddsv.Transition('unlock', '5', ddsv.GuardTrue(), schema.action({'mutex': 'False'}))]),
+    ddsv.StateTransition('5', [])
+]
+
+q_state_trans_list = [
+    ddsv.StateTransition('0', [ddsv.Transition('lock',   '1', lock, schema.action({'mutex': 'True'}))]),
+    ddsv.StateTransition('1', [ddsv.Transition('read',   '2', ddsv.GuardTrue(), schema.action({'t2': 'x'}))]),
+    ddsv.StateTransition('2', [ddsv.Transition('inc',    '3', ddsv.GuardTrue(), schema.action({'t2': 't2 + 1'}))]),
+    ddsv.StateTransition('3', [ddsv.Transition('write',  '4', ddsv.GuardTrue(), schema.action({'x': 't2'}))]),
+    ddsv.StateTransition('4', [ddsv.Transition('unlock', '5', ddsv.GuardTrue(), schema.action({'mutex': 'False'}))]),
+    ddsv.StateTransition('5', [])
+]
+
+P = ddsv.Process('P', p_state_trans_list)
+Q = ddsv.Process('Q', q_state_trans_list)
+
+P.save_graph('m_inc2_2_P')
+Q.save_graph('m_inc2_2_Q')
+
+lts_tbl = ddsv.concurrent_composition([P, Q], schema.vars(), 'm_inc2_2')
+lts_tbl.save_graph('m_inc2_2')
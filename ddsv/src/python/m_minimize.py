@@ -0,0 +1,20 @@
+import ddsv
+import m_prod_cons3
+
+def summary(name, lts_tbl):
+    print('{0:10} states={1} transitions={2} deadlocks={3}'.format(name, len(lts_tbl), len(lts_tbl.edges()), \
+        sorted([ s.to_str() for s in lts_tbl.deadlocks() ])))
+
+# m_prod_cons3.lts_tbl comes from the plain Bfs of concurrent_composition
+summary('Bfs', m_prod_cons3.lts_tbl)
+
+# states are only merged when they agree on the shared variables and can mimic each other's moves;
+# every state of m_prod_cons3 is distinguishable that way
+summary('strong', ddsv.minimize(m_prod_cons3.lts_tbl))
+
+# hiding the locking protocol leaves produce and consume visible; branching bisimulation then
+# also folds the tau steps in between
+hidden = [ 'lock', 'unlock', 'wait', 'wakeup', 'signal' ]
+lts_tbl = ddsv.minimize(m_prod_cons3.lts_tbl, branching=True, hidden=hidden, key=lambda s: s.shared_vars.count)
+summary('branching', lts_tbl)
+lts_tbl.save_graph('m_minimize')
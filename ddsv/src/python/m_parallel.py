@@ -0,0 +1,34 @@
+import time
+
+import ddsv
+import m_prod_cons3
+
+# m_prod_cons3.lts_tbl comes from the plain Bfs of concurrent_composition
+process_list = m_prod_cons3.process_list
+shared_vars = m_prod_cons3.shared_vars
+bfs_tbl = m_prod_cons3.lts_tbl
+
+lts_tbl = ddsv.concurrent_composition(process_list, shared_vars, 'm_parallel', ddsv.ParallelBfs(2))
+print('Bfs:         states={0} transitions={1} deadlocks={2}'.format(len(bfs_tbl), len(bfs_tbl.edges()), len(bfs_tbl.deadlocks())))
+print('ParallelBfs: states={0} transitions={1} deadlocks={2}'.format(len(lts_tbl), len(lts_tbl.edges()), len(lts_tbl.deadlocks())))
+print('same deadlocks: {0}'.format(sorted([ s.to_str() for s in lts_tbl.deadlocks() ]) == sorted([ s.to_str() for s in bfs_tbl.deadlocks() ])))
+
+# forking the workers costs more than m_prod_cons3 takes to explore; ParallelBfs starts to pay off
+# on state spaces of tens of thousands of states when there is more than one core, e.g. this
+# ring of queues (51696 states for N = 9; the parent only spends about 0.1s of it)
+N = 9
+schema = ddsv.Schema([ ddsv.Var('c', range(0, 4), size=N, per_process=True) ], consts={ 'N': N, 'LEN': 3 })
+
+ring_state_trans_list = [
+    ddsv.StateTransition('0', [ddsv.Transition('deque', '1', schema.guard('0 < c[pid]'), schema.action({'c[pid]': 'c[pid] - 1'}))]),
+    ddsv.StateTransition('1', [ddsv.Transition('enque', '0', schema.guard('c[(pid + 1) % N] < LEN'), \
+        schema.action({'c[(pid + 1) % N]': 'c[(pid + 1) % N] + 1'}))])
+]
+
+ring = [ ddsv.Process('P{0}'.format(i), ring_state_trans_list) for i in range(N) ]
+r0 = schema.vars(c=[ 3, 3 ] + [ 0 ] * (N - 2))
+
+for name, strategy in [ ('Bfs', ddsv.Bfs()), ('ParallelBfs(1)', ddsv.ParallelBfs(1)), ('ParallelBfs(4)', ddsv.ParallelBfs(4)) ]:
+    start = time.time()
+    t = strategy.explore(ring, ddsv.State(r0, ring), False)
+    print('{0:14} states={1} {2:.2f}s'.format(name, len(t), time.time() - start))
@@ -0,0 +1,34 @@
+import ddsv
+import m_inc2
+
+def summary(name, lts_tbl):
+    print('{0:10} states={1} transitions={2} deadlocks={3}'.format(name, len(lts_tbl), len(lts_tbl.edges()), \
+        sorted([ s.to_str() for s in lts_tbl.deadlocks() ])))
+
+# m_inc2 declares the read/write sets of its guards and actions by hand
+summary('Bfs', m_inc2.lts_tbl)
+summary('Bfs(por)', ddsv.concurrent_composition([m_inc2.P, m_inc2.Q], m_inc2.SharedVars(), 'm_por', ddsv.Bfs(por=True)))
+
+# a schema derives them itself; t[pid] is a separate element per process, so the local increments
+# commute and only the critical sections are interleaved
+N = 3
+schema = ddsv.Schema([
+    ddsv.Var('mutex', bool),
+    ddsv.Var('x', range(0, 2 * N + 1)),
+    ddsv.Var('t', range(0, 3), size=N, per_process=True)
+])
+
+p_state_trans_list = [
+    ddsv.StateTransition('0', [ddsv.Transition('inc',    '1', ddsv.GuardTrue(), schema.action({'t[pid]': 't[pid] + 1'}))]),
+    ddsv.StateTransition('1', [ddsv.Transition('inc',    '2', ddsv.GuardTrue(), schema.action({'t[pid]': 't[pid] + 1'}))]),
+    ddsv.StateTransition('2', [ddsv.Transition('lock',   '3', schema.guard('not mutex'), schema.action({'mutex': 'True'}))]),
+    ddsv.StateTransition('3', [ddsv.Transition('write',  '4', ddsv.GuardTrue(), schema.action({'x': 'x + t[pid]'}))]),
+    ddsv.StateTransition('4', [ddsv.Transition('unlock', '5', ddsv.GuardTrue(), schema.action({'mutex': 'False'}))]),
+    ddsv.StateTransition('5', [])
+]
+
+process_list = [ ddsv.Process('P{0}'.format(i), p_state_trans_list) for i in range(N) ]
+
+summary('Bfs', ddsv.concurrent_composition(process_list, schema.vars(), 'm_por'))
+summary('Bfs(por)', ddsv.concurrent_composition(process_list, schema.vars(), 'm_por', ddsv.Bfs(por=True)))
+summary('Dfs(por)', ddsv.concurrent_composition(process_list, schema.vars(), 'm_por', ddsv.Dfs(por=True)))
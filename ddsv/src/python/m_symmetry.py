@@ -0,0 +1,31 @@
+import ddsv
+
+def summary(name, lts_tbl):
+    print('{0:14} states={1} transitions={2} deadlocks={3}'.format(name, len(lts_tbl), len(lts_tbl.edges()), \
+        sorted([ s.to_str() for s in lts_tbl.deadlocks() ])))
+
+# m_inc2_2 for N processes: t1 and t2 become t[pid], so every process runs the very same transitions
+N = 3
+schema = ddsv.Schema([
+    ddsv.Var('mutex', bool),
+    ddsv.Var('x', range(0, N + 1)),
+    ddsv.Var('t', range(0, N + 1), size=N, per_process=True)
+])
+
+lock = schema.guard('not mutex')
+
+p_state_trans_list = [
+    ddsv.StateTransition('0', [ddsv.Transition('lock',   '1', lock, schema.action({'mutex': 'True'}))]),
+    ddsv.StateTransition('1', [ddsv.Transition('read',   '2', ddsv.GuardTrue(), schema.action({'t[pid]': 'x'}))]),
+    ddsv.StateTransition('2', [ddsv.Transition('inc',    '3', ddsv.GuardTrue(), schema.action({'t[pid]': 't[pid] + 1'}))]),
+    ddsv.StateTransition('3', [ddsv.Transition('write',  '4', ddsv.GuardTrue(), schema.action({'x': 't[pid]'}))]),
+    ddsv.StateTransition('4', [ddsv.Transition('unlock', '5', ddsv.GuardTrue(), schema.action({'mutex': 'False'}))]),
+    ddsv.StateTransition('5', [])
+]
+
+process_list = [ ddsv.Process('P{0}'.format(i), p_state_trans_list) for i in range(N) ]
+
+# the reduced table keeps one state per orbit: the N! final states that only differ in which
+# process got which t[pid] collapse into one
+summary('Bfs', ddsv.concurrent_composition(process_list, schema.vars(), 'm_symmetry'))
+summary('Bfs(symmetry)', ddsv.concurrent_composition(process_list, schema.vars(), 'm_symmetry', ddsv.Bfs(symmetry=[process_list])))
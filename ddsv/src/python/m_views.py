@@ -0,0 +1,20 @@
+import ddsv
+import m_prod_cons3
+
+# m_prod_cons3.lts_tbl comes from the plain Bfs of concurrent_composition; a view picks the part
+# of it that is worth drawing instead of laying out every state
+lts_tbl = m_prod_cons3.lts_tbl
+nodes, edges = lts_tbl.graph()
+print('{0:14} nodes={1} edges={2}'.format('Bfs', len(nodes), len(edges)))
+
+views = [
+    ('deadlocks', ddsv.DeadlockTraces()),
+    ('neighborhood', ddsv.Neighborhood(lts_tbl.deadlocks(), 2)),
+    ('condensation', ddsv.Condensation()),
+    ('sample', ddsv.Sample(20, seed=1))
+]
+
+for name, view in views:
+    nodes, edges = lts_tbl.graph(view)
+    print('{0:14} nodes={1} edges={2}'.format(name, len(nodes), len(edges)))
+    lts_tbl.export('m_views_{0}'.format(name), 'dot', view)
@@ -0,0 +1,34 @@
+import sys
+import mcctl
+
+sys.path.append('../../../ddsv/src/python')
+
+import ddsv
+import m_inc2_2
+
+# m_inc2_2 plus a process that spins forever without touching the shared variables
+spin_state_trans_list = [
+    ddsv.StateTransition('0', [ddsv.Transition('spin', '0', ddsv.GuardTrue(), ddsv.ActionNop())])
+]
+
+def func0(shared_vars):
+    return shared_vars.t1 > 0
+
+t1 = mcctl.Prop('t1>0', func0)
+f = mcctl.F(t1)
+
+# without fairness the scheduler may run S alone forever, so P never gets to increment t1
+process_list = [m_inc2_2.P, m_inc2_2.Q, ddsv.Process('S', spin_state_trans_list)]
+lasso = mcctl.LtlChecker(process_list, m_inc2_2.schema.vars()).check(f)
+print('{0}: {1}'.format(f.to_str(), lasso == None))
+if lasso != None:
+    lasso.print()
+
+# weak fairness: a process that stays enabled is eventually scheduled, which rules that run out
+P = ddsv.Process('P', m_inc2_2.p_state_trans_list, fairness='weak')
+Q = ddsv.Process('Q', m_inc2_2.q_state_trans_list, fairness='weak')
+process_list = [P, Q, ddsv.Process('S', spin_state_trans_list)]
+lasso = mcctl.LtlChecker(process_list, m_inc2_2.schema.vars()).check(f)
+print('{0} (weak fairness): {1}'.format(f.to_str(), lasso == None))
+if lasso != None:
+    lasso.print()
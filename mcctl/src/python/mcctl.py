@@ -1,161 +1,658 @@
-import os
-import sys
-import pygraphviz as pgv
-from abc import ABCMeta
-from abc import abstractmethod
-
-sys.path.append('../../../ddsv/src/python')
-
-import ddsv
-
-# ------------------------------------------------------------
-
-class Interface(metaclass=ABCMeta):
-    @abstractmethod
-    def exec(self, shared_vars, out_list):
-        pass
-
-    @abstractmethod
-    def to_str(self):
-        pass
-
-    @abstractmethod
-    def to_graph_str(self):
-        pass
-
-class AbstractFormula(Interface):
-    def exec(self, shared_vars, out_list):
-        res_list = [ f.exec(shared_vars, out_list) for f in self._f_list ]
-        is_true = self._is_true(res_list)
-
-        if is_true:
-            out_list.append(self.to_str())
-
-        return is_true
-
-    @abstractmethod
-    def _is_true(self, list):
-        pass
-
-    def to_graph_str(self, list):
-        return '\\n'.join(list)
-
-    def print(self, shared_vars):
-        print(self.to_str())
-
-class Prop(Interface):
-    def __init__(self, label, func):
-        self.label = label
-        self.func = func
-        self.str = None
-
-    def exec(self, shared_vars, out_list):
-        res = self.func(shared_vars)
-        if res:
-            out_list.append(self.to_str())
-        return res
-
-    def to_str(self):
-        return self.label
-
-    def to_graph_str(self):
-        return self.str
-
-class Or(AbstractFormula):
-    def __init__(self, g, h):
-        self._f_list = [ g, h ]
-        self.str = None
-
-    def _is_true(self, list):
-        assert 2 <= len(list)
-        return any(list)
-
-    def to_str(self):
-        str = ', '.join([ f.to_str() for f in self._f_list ])
-        str = 'or ({0})'.format(str)
-        return str
-
-class And(AbstractFormula):
-    def __init__(self, g, h):
-        self._f_list = [ g, h ]
-        self.str = None
-
-    def _is_true(self, list):
-        assert 2 <= len(list)
-        return all(list)
-
-    def to_str(self):
-        str = ', '.join([ f.to_str() for f in self._f_list ])
-        str = 'and ({0})'.format(str)
-        return str
-
-class Not(AbstractFormula):
-    def __init__(self, g):
-        self._f_list = [ g ]
-        self.str = None
-
-    def _is_true(self, list):
-        assert len(list) == 1
-        return not list[0]
-
-    def to_str(self):
-        assert len(self._f_list) == 1
-        return 'not ({0})'.format(self._f_list[0].to_str())
-
-class LtsTblMarker:
-    def __init__(self, lts_tbl, formula):
-        self._idx_of_prev_state = lts_tbl._idx_of_prev_state
-        self._idx_of_who        = lts_tbl._idx_of_who
-        self._idx_of_tran       = lts_tbl._idx_of_tran
-        self._idx_of_direction  = lts_tbl._idx_of_direction
-        self._tbl               = lts_tbl._tbl
-        self._key_to_id         = lts_tbl._key_to_id
-
-        self._dir_name = 'img'
-
-        self._formula = formula
-
-    def save_graph(self, name):
-        G = pgv.AGraph(directed=True, strict=False)
-
-        for i, k in enumerate(self._tbl):
-            list = []
-            is_true = self._formula.exec(k.shared_vars, list)
-            label = '{0}\\n{1}'.format(k.to_graph_str(self._key_to_id[k]), self._formula.to_graph_str(list))
-
-            if is_true:
-                G.add_node(label, style='filled', fillcolor='palegreen')
-            else:
-                G.add_node(label)
-
-        for k, pair in [(k, pair) for k in (self._tbl) for pair in self._tbl[k] if pair != (None, None, None, None)]:
-            if pair[self._idx_of_direction] == 'foward':
-                list = []
-                self._formula.exec(pair[self._idx_of_prev_state].shared_vars, list)
-                src = '{0}\\n{1}'.format( \
-                    pair[self._idx_of_prev_state].to_graph_str(self._key_to_id[pair[self._idx_of_prev_state]]), \
-                    self._formula.to_graph_str(list))
-
-                list = []
-                self._formula.exec(k.shared_vars, list)
-                dst = '{0}\\n{1}'.format(k.to_graph_str(self._key_to_id[k]), self._formula.to_graph_str(list))
-            elif pair[self._idx_of_direction] == 'reverse':
-                list = []
-                self._formula.exec(k.shared_vars, list)
-                src = '{0}\\n{1}'.format(k.to_graph_str(self._key_to_id[k]), self._formula.to_graph_str(list))
-
-                list = []
-                self._formula.exec(pair[self._idx_of_prev_state].shared_vars, list)
-                dst = '{0}\\n{1}'.format( \
-                    pair[self._idx_of_prev_state].to_graph_str(self._key_to_id[pair[self._idx_of_prev_state]]), \
-                    self._formula.to_graph_str(list))
-
-            action = '{0}.{1}'.format(pair[self._idx_of_who].name, pair[self._idx_of_tran].label)
-            G.add_edge(src, dst, label=action)
-
-        sorted(G.edges(keys=True))
-        if not os.path.isdir(self._dir_name):
-            os.mkdir(self._dir_name)
-
-        G.layout(prog='dot')
-        G.draw(os.path.join(self._dir_name, '{0}.png'.format(name)))
+import os
+import sys
+from collections import deque
+
+try:
+    import pygraphviz as pgv
+except ImportError:
+    pgv = None
+
+from abc import ABCMeta
+from abc import abstractmethod
+
+sys.path.append('../../../ddsv/src/python')
+
+import ddsv
+
+# ------------------------------------------------------------
+
+class Interface(metaclass=ABCMeta):
+    @abstractmethod
+    def exec(self, shared_vars, out_list):
+        pass
+
+    @abstractmethod
+    def to_str(self):
+        pass
+
+    @abstractmethod
+    def to_graph_str(self):
+        pass
+
+class AbstractFormula(Interface):
+    def exec(self, shared_vars, out_list):
+        res_list = [ f.exec(shared_vars, out_list) for f in self._f_list ]
+        is_true = self._is_true(res_list)
+
+        if is_true:
+            out_list.append(self.to_str())
+
+        return is_true
+
+    def sat(self, checker):
+        return self._sat([ checker.check(f) for f in self._f_list ], checker.all)
+
+    @abstractmethod
+    def _is_true(self, list):
+        pass
+
+    @abstractmethod
+    def _sat(self, list, all):
+        pass
+
+    def to_graph_str(self, list):
+        return '\n'.join(list)
+
+    def print(self, shared_vars):
+        print(self.to_str())
+
+class Prop(Interface):
+    def __init__(self, label, func):
+        self.label = label
+        self.func = func
+        self.str = None
+        self._f_list = []
+
+    def exec(self, shared_vars, out_list):
+        res = self.func(shared_vars)
+        if res:
+            out_list.append(self.to_str())
+        return res
+
+    def sat(self, checker):
+        return checker.label(self.func)
+
+    def to_str(self):
+        return self.label
+
+    def to_graph_str(self):
+        return self.str
+
+class Or(AbstractFormula):
+    def __init__(self, g, h):
+        self._f_list = [ g, h ]
+        self.str = None
+
+    def _is_true(self, list):
+        assert 2 <= len(list)
+        return any(list)
+
+    def _sat(self, list, all):
+        return list[0] | list[1]
+
+    def to_str(self):
+        str = ', '.join([ f.to_str() for f in self._f_list ])
+        str = 'or ({0})'.format(str)
+        return str
+
+class And(AbstractFormula):
+    def __init__(self, g, h):
+        self._f_list = [ g, h ]
+        self.str = None
+
+    def _is_true(self, list):
+        assert 2 <= len(list)
+        return all(list)
+
+    def _sat(self, list, all):
+        return list[0] & list[1]
+
+    def to_str(self):
+        str = ', '.join([ f.to_str() for f in self._f_list ])
+        str = 'and ({0})'.format(str)
+        return str
+
+class Not(AbstractFormula):
+    def __init__(self, g):
+        self._f_list = [ g ]
+        self.str = None
+
+    def _is_true(self, list):
+        assert len(list) == 1
+        return not list[0]
+
+    def _sat(self, list, all):
+        return all & ~list[0]
+
+    def to_str(self):
+        assert len(self._f_list) == 1
+        return 'not ({0})'.format(self._f_list[0].to_str())
+
+class TemporalFormula(Interface):
+    _op = None
+
+    def __init__(self, *f_list):
+        self._f_list = list(f_list)
+        self.str = None
+
+    def exec(self, shared_vars, out_list):
+        raise TypeError('{0} cannot be evaluated on a single state; use ModelChecker'.format(self.to_str()))
+
+    def to_str(self):
+        return '{0} ({1})'.format(self._op, ', '.join([ f.to_str() for f in self._f_list ]))
+
+    def to_graph_str(self, list):
+        return '\n'.join(list)
+
+class EX(TemporalFormula):
+    _op = 'EX'
+
+    def sat(self, checker):
+        return checker.ex(checker.check(self._f_list[0]))
+
+class AX(TemporalFormula):
+    _op = 'AX'
+
+    def sat(self, checker):
+        return checker.all & ~checker.ex(checker.all & ~checker.check(self._f_list[0]))
+
+class EU(TemporalFormula):
+    _op = 'EU'
+
+    def sat(self, checker):
+        return checker.eu(checker.check(self._f_list[0]), checker.check(self._f_list[1]))
+
+class AU(TemporalFormula):
+    _op = 'AU'
+
+    def sat(self, checker):
+        return checker.au(checker.check(self._f_list[0]), checker.check(self._f_list[1]))
+
+class EF(TemporalFormula):
+    _op = 'EF'
+
+    def sat(self, checker):
+        return checker.eu(checker.all, checker.check(self._f_list[0]))
+
+class AF(TemporalFormula):
+    _op = 'AF'
+
+    def sat(self, checker):
+        return checker.all & ~checker.eg(checker.all & ~checker.check(self._f_list[0]))
+
+class EG(TemporalFormula):
+    _op = 'EG'
+
+    def sat(self, checker):
+        return checker.eg(checker.check(self._f_list[0]))
+
+class AG(TemporalFormula):
+    _op = 'AG'
+
+    def sat(self, checker):
+        return checker.all & ~checker.eu(checker.all, checker.all & ~checker.check(self._f_list[0]))
+
+class PathFormula(TemporalFormula):
+    def sat(self, checker):
+        raise TypeError('{0} is a path formula; use LtlChecker'.format(self.to_str()))
+
+class X(PathFormula):
+    _op = 'X'
+
+class U(PathFormula):
+    _op = 'U'
+
+class R(PathFormula):
+    _op = 'R'
+
+class F(PathFormula):
+    _op = 'F'
+
+class G(PathFormula):
+    _op = 'G'
+
+class ModelChecker:
+    _to_digits = bytes.maketrans(b'\x00\x01', b'01')
+    _from_digits = bytes.maketrans(b'01', b'\x00\x01')
+
+    def __init__(self, lts_tbl):
+        self._n = len(lts_tbl)
+        self.all = (1 << self._n) - 1
+        self._lts_tbl = lts_tbl
+        self._store = None
+        self._cache = {}
+        self._flags_cache = {}
+
+    def _index(self):
+        if self._store == None:
+            self._store = self._lts_tbl.edge_store()
+        return self._store
+
+    def check(self, formula):
+        if formula not in self._cache:
+            self._cache[formula] = formula.sat(self)
+        return self._cache[formula]
+
+    def flags(self, formula):
+        if formula not in self._flags_cache:
+            self._flags_cache[formula] = self._flags(self.check(formula))
+        return self._flags_cache[formula]
+
+    def holds(self, formula, idx=0):
+        return bool(self.check(formula) >> idx & 1)
+
+    def ids(self, mask):
+        flags = self._flags(mask)
+        return [ i for i in range(self._n) if flags[i] ]
+
+    def label(self, func):
+        return self._mask(bytearray([ 1 if func(self._lts_tbl.shared_vars(i)) else 0 for i in range(self._n) ]))
+
+    def ex(self, mask):
+        store = self._index()
+        start, pred = store.in_start, store.in_src
+        flags = self._flags(mask)
+        res = bytearray(self._n)
+        for v in range(self._n):
+            if flags[v]:
+                for u in pred[start[v]:start[v + 1]]:
+                    res[u] = 1
+        return self._mask(res)
+
+    def eu(self, mask_f, mask_g):
+        ok = self._flags(mask_f)
+        res = self._flags(mask_g)
+        self._backward(res, ok)
+        return self._mask(res)
+
+    def _backward(self, res, ok):
+        store = self._index()
+        start, pred = store.in_start, store.in_src
+        stack = [ v for v in range(self._n) if res[v] ]
+        while stack:
+            v = stack.pop()
+            for u in pred[start[v]:start[v + 1]]:
+                if not res[u] and ok[u]:
+                    res[u] = 1
+                    stack.append(u)
+
+    def au(self, mask_f, mask_g):
+        store = self._index()
+        start, pred = store.in_start, store.in_src
+        ok = self._flags(mask_f)
+        res = self._flags(mask_g)
+        out = store.out_start
+        count = [ out[v + 1] - out[v] for v in range(self._n) ]
+        stack = [ v for v in range(self._n) if res[v] ]
+        while stack:
+            v = stack.pop()
+            for u in pred[start[v]:start[v + 1]]:
+                count[u] -= 1
+                if count[u] == 0 and not res[u] and ok[u]:
+                    res[u] = 1
+                    stack.append(u)
+        return self._mask(res)
+
+    def eg(self, mask):
+        store = self._index()
+        ok = self._flags(mask)
+        res = bytearray(self._n)
+        succs = [ store.successors(v) if ok[v] else () for v in range(self._n) ]
+        for comp in ddsv._sccs(self._n, succs, ok):
+            succ = store.successors(comp[0])
+            if 1 < len(comp) or comp[0] in succ or not succ:
+                for v in comp:
+                    res[v] = 1
+
+        self._backward(res, ok)
+        return self._mask(res)
+
+    def _flags(self, mask):
+        digits = bin(mask)[:1:-1] if mask else ''
+        return bytearray(digits.ljust(self._n, '0').encode().translate(self._from_digits))
+
+    def _mask(self, flags):
+        return int(bytes(flags).translate(self._to_digits)[::-1] or b'0', 2)
+
+_true  = ('true',)
+_false = ('false',)
+
+def _nnf(formula, neg, props):
+    if isinstance(formula, Prop):
+        if formula not in props:
+            props[formula] = len(props)
+        return ('nap' if neg else 'ap', props[formula])
+
+    if isinstance(formula, Not):
+        return _nnf(formula._f_list[0], not neg, props)
+
+    a = [ _nnf(f, neg, props) for f in formula._f_list ]
+    if isinstance(formula, And):
+        return ('or' if neg else 'and', a[0], a[1])
+    if isinstance(formula, Or):
+        return ('and' if neg else 'or', a[0], a[1])
+    if isinstance(formula, X):
+        return ('X', a[0])
+    if isinstance(formula, U):
+        return ('R' if neg else 'U', a[0], a[1])
+    if isinstance(formula, R):
+        return ('U' if neg else 'R', a[0], a[1])
+    if isinstance(formula, F):
+        return ('R', _false, a[0]) if neg else ('U', _true, a[0])
+    if isinstance(formula, G):
+        return ('U', _true, a[0]) if neg else ('R', _false, a[0])
+    raise TypeError('{0} is not an LTL formula'.format(formula.to_str()))
+
+def _is_literal(f):
+    return f[0] == 'ap' or f[0] == 'nap'
+
+def _negate_literal(f):
+    return ('nap' if f[0] == 'ap' else 'ap', f[1])
+
+def _buchi(phi):
+    # tableau construction of Gerth, Peled, Vardi and Wolper
+    incoming = []
+    old = []
+    next = []
+    stack = [ ({ -1 }, { phi }, frozenset(), frozenset()) ]
+    while stack:
+        inc, new, o, n = stack.pop()
+        if not new:
+            for i in range(len(old)):
+                if old[i] == o and next[i] == n:
+                    incoming[i] |= inc
+                    break
+            else:
+                incoming.append(set(inc))
+                old.append(o)
+                next.append(n)
+                stack.append(({ len(old) - 1 }, set(n), frozenset(), frozenset()))
+            continue
+
+        new = set(new)
+        f = new.pop()
+        if f in o:
+            stack.append((inc, new, o, n))
+        elif f == _false or (_is_literal(f) and _negate_literal(f) in o):
+            pass
+        elif f == _true or _is_literal(f):
+            stack.append((inc, new, o | { f }, n))
+        elif f[0] == 'and':
+            stack.append((inc, new | ({ f[1], f[2] } - o), o | { f }, n))
+        elif f[0] == 'X':
+            stack.append((inc, new, o | { f }, n | { f[1] }))
+        elif f[0] == 'or':
+            stack.append((inc, new | ({ f[1] } - o), o | { f }, n))
+            stack.append((inc, new | ({ f[2] } - o), o | { f }, n))
+        elif f[0] == 'U':
+            stack.append((inc, new | ({ f[1] } - o), o | { f }, n | { f }))
+            stack.append((inc, new | ({ f[2] } - o), o | { f }, n))
+        elif f[0] == 'R':
+            stack.append((inc, new | ({ f[2] } - o), o | { f }, n | { f }))
+            stack.append((inc, new | ({ f[1], f[2] } - o), o | { f }, n))
+
+    until = set([ f for o in old for f in o if f[0] == 'U' ])
+    acc = [ set([ i for i in range(len(old)) if u not in old[i] or u[2] in old[i] ]) for u in sorted(until, key=repr) ]
+    init = [ i for i in range(len(old)) if -1 in incoming[i] ]
+    succ = [ [ j for j in range(len(old)) if i in incoming[j] ] for i in range(len(old)) ]
+    lits = [ [ (f[1], f[0] == 'ap') for f in o if _is_literal(f) ] for o in old ]
+    return init, succ, lits, acc
+
+def _sccs_within(nodes, succ):
+    local = { v:i for i, v in enumerate(nodes) }
+    adj = [ [ local[w] for w, _, _ in succ[v] if w in local ] for v in nodes ]
+    return [ [ nodes[i] for i in comp ] for comp in ddsv._sccs(len(nodes), adj) ]
+
+def _path_within(src, dst, succ, inside):
+    prev = { src: None }
+    frontier = deque([ src ])
+    while dst not in prev:
+        v = frontier.popleft()
+        for w, p, tran in succ[v]:
+            if w in inside and w not in prev:
+                prev[w] = (v, p, tran)
+                frontier.append(w)
+
+    res = []
+    while prev[dst] != None:
+        v, p, tran = prev[dst]
+        res.insert(0, (dst, p, tran))
+        dst = v
+    return res
+
+class Lasso:
+    def __init__(self, prefix, cycle):
+        self.prefix = prefix
+        self.cycle = cycle
+
+    def print(self):
+        print('--------------------')
+        for idx, (s, p, tran) in enumerate(self.prefix + self.cycle):
+            if tran == None:
+                str_tran = '{0:4} {1:10}'.format('---', '---')
+            else:
+                str_tran = '{0:4} {1:10}'.format(p.name, tran.label)
+            print('{0:4} {1:14} {2:32}'.format(idx, str_tran, s.to_str()))
+        print('{0:4} back to {1}'.format('', len(self.prefix) - 1))
+
+class LtlChecker:
+    def __init__(self, process_list, r0):
+        self._s0 = ddsv.State(r0, process_list)
+        self.states = 0
+
+    def check(self, formula):
+        props = {}
+        phi = _nnf(formula, True, props)
+        self._props = sorted(props, key=lambda p: props[p])
+        self._init, self._succ, self._lits, self._acc = _buchi(phi)
+        self._labels = {}
+        self.states = 0
+
+        constraints = [ c for p in self._s0.p_list for c in p.fairness_constraints() ]
+        if constraints:
+            return self._fair_check(constraints)
+
+        visited = set()
+        flagged = set()
+        on_stack = {}
+        for n in self._init:
+            root = (self._s0, n, 0)
+            if root in visited or not self._match(self._s0, n):
+                continue
+
+            visited.add(root)
+            on_stack[root] = 0
+            stack = [ [ root, None, None, self._next(root), 0 ] ]
+            while stack:
+                top = stack[-1]
+                if top[4] < len(top[3]):
+                    t, p, tran = top[3][top[4]]
+                    top[4] += 1
+                    if t not in visited:
+                        visited.add(t)
+                        on_stack[t] = len(stack)
+                        stack.append([ t, p, tran, self._next(t), 0 ])
+                    continue
+
+                if self._is_accepting(top[0]):
+                    lasso = self._cycle(stack, on_stack, flagged)
+                    if lasso != None:
+                        self.states = len(visited)
+                        return lasso
+                del on_stack[top[0]]
+                stack.pop()
+
+        self.states = len(visited)
+        return None
+
+    def _fair_check(self, constraints):
+        ids = {}
+        keys = []
+        succ = []
+        parent = []
+        for n in self._init:
+            root = (self._s0, n, 0)
+            if root not in ids and self._match(self._s0, n):
+                ids[root] = len(keys)
+                keys.append(root)
+                parent.append(None)
+        idx = 0
+        while idx < len(keys):
+            edges = []
+            for t, p, tran in self._next(keys[idx]):
+                if t not in ids:
+                    ids[t] = len(keys)
+                    keys.append(t)
+                    parent.append((idx, p, tran))
+                edges.append((ids[t], p, tran))
+            succ.append(edges)
+            idx += 1
+        self.states = len(keys)
+
+        enabled = []
+        for key in keys:
+            moves = [ (p, tran) for _, p, tran in key[0].successors() ]
+            enabled.append([ any([ m[0] == p and (tran == None or m[1] == tran) for m in moves ]) for _, p, tran in constraints ])
+
+        work = [ list(range(len(keys))) ]
+        while work:
+            for comp in _sccs_within(work.pop(), succ):
+                inside = set(comp)
+                edges = [ (v, e) for v in comp for e in succ[v] if e[0] in inside ]
+                if not edges or not any([ self._is_accepting(keys[v]) for v in comp ]):
+                    continue
+
+                taken = [ [ (v, e) for v, e in edges if p == e[1] and (tran == None or tran == e[2]) ] for _, p, tran in constraints ]
+                bad = set([ v for c, (kind, _, _) in enumerate(constraints) if kind == 'strong' and not taken[c] for v in comp if enabled[v][c] ])
+                if bad:
+                    work.append([ v for v in comp if v not in bad ])
+                    continue
+                if any([ kind == 'weak' and not taken[c] and all([ enabled[v][c] for v in comp ]) for c, (kind, _, _) in enumerate(constraints) ]):
+                    continue
+
+                goals = [ [ (v, None) for v in comp if self._is_accepting(keys[v]) ][0] ]
+                for c, (kind, _, _) in enumerate(constraints):
+                    if taken[c]:
+                        goals.append(taken[c][0])
+                    elif kind == 'weak':
+                        goals.append([ (v, None) for v in comp if not enabled[v][c] ][0])
+                return self._fair_lasso(keys, succ, parent, inside, edges[0], goals)
+        return None
+
+    def _fair_lasso(self, keys, succ, parent, inside, first, goals):
+        entry = first[0]
+        prefix = []
+        v = entry
+        while v != None:
+            link = parent[v]
+            prefix.insert(0, (keys[v][0],) + ((None, None) if link == None else link[1:]))
+            v = None if link == None else link[0]
+
+        cycle = [ (keys[first[1][0]][0], first[1][1], first[1][2]) ]
+        v = first[1][0]
+        for u, e in goals + [ (entry, None) ]:
+            cycle += [ (keys[w][0], p, tran) for w, p, tran in _path_within(v, u, succ, inside) ]
+            v = u
+            if e != None:
+                cycle.append((keys[e[0]][0], e[1], e[2]))
+                v = e[0]
+        return Lasso(prefix, cycle)
+
+    def _cycle(self, outer, on_stack, flagged):
+        seed = outer[-1][0]
+        stack = [ [ seed, None, None, self._next(seed), 0 ] ]
+        while stack:
+            top = stack[-1]
+            if top[4] == len(top[3]):
+                stack.pop()
+                continue
+
+            t, p, tran = top[3][top[4]]
+            top[4] += 1
+            if t in on_stack:
+                m = on_stack[t]
+                prefix = [ (e[0][0], e[1], e[2]) for e in outer[:m + 1] ]
+                cycle = [ (e[0][0], e[1], e[2]) for e in outer[m + 1:] + stack[1:] ]
+                return Lasso(prefix, cycle + [ (t[0], p, tran) ])
+            if t not in flagged:
+                flagged.add(t)
+                stack.append([ t, p, tran, self._next(t), 0 ])
+        return None
+
+    def _next(self, key):
+        s, n, i = key
+        if self._acc and n in self._acc[i]:
+            i = (i + 1) % len(self._acc)
+
+        moves = [ (s.successor(j, tran), p, tran) for j, p, tran in s.successors() ]
+        if not moves:
+            moves = [ (s, None, None) ]
+        return [ ((t, m, i), p, tran) for t, p, tran in moves for m in self._succ[n] if self._match(t, m) ]
+
+    def _is_accepting(self, key):
+        return not self._acc or (key[2] == 0 and key[1] in self._acc[0])
+
+    def _match(self, s, n):
+        if s not in self._labels:
+            self._labels[s] = [ bool(p.func(s.shared_vars)) for p in self._props ]
+        label = self._labels[s]
+        return all([ label[i] == v for i, v in self._lits[n] ])
+
+def _post_order(formula, out_list):
+    for f in formula._f_list:
+        _post_order(f, out_list)
+    out_list.append(formula)
+    return out_list
+
+class LtsTblMarker:
+    def __init__(self, lts_tbl, formula, checker=None):
+        self._lts_tbl           = lts_tbl
+
+        self._dir_name = 'img'
+
+        self._formula = formula
+        self._checker = checker if checker != None else ModelChecker(lts_tbl)
+        self._sub_list = None
+        self._label_cache = {}
+
+    def _label(self, idx):
+        if idx not in self._label_cache:
+            if self._sub_list == None:
+                self._sub_list = [ (f.to_str(), self._checker.flags(f)) for f in _post_order(self._formula, []) ]
+            list = [ s for s, f in self._sub_list if f[idx] ]
+            k = self._lts_tbl.state(idx)
+            self._label_cache[idx] = '{0}\n{1}'.format(k.to_graph_str(idx), self._formula.to_graph_str(list))
+        return self._label_cache[idx]
+
+    def _color(self, idx):
+        return 'palegreen' if self._checker.flags(self._formula)[idx] else None
+
+    def export(self, name, format='dot', view=None):
+        if not os.path.isdir(self._dir_name):
+            os.mkdir(self._dir_name)
+
+        with ddsv.graph_writer(os.path.join(self._dir_name, '{0}.{1}'.format(name, format)), format) as w:
+            self._lts_tbl.write(w, view, self._label, self._color)
+        return w.path
+
+    def save_graph(self, name, view=None):
+        if pgv == None:
+            raise ImportError('save_graph needs pygraphviz; use export() instead')
+        G = pgv.AGraph(directed=True, strict=False)
+
+        nodes, edges = self._lts_tbl.graph(view, self._label, self._color)
+        for idx, label, color in nodes:
+            if color == None:
+                G.add_node(idx, label=label)
+            else:
+                G.add_node(idx, label=label, style='filled', fillcolor=color)
+
+        for src, dst, label in edges:
+            G.add_edge(src, dst, label=label)
+
+        sorted(G.edges(keys=True))
+        if not os.path.isdir(self._dir_name):
+            os.mkdir(self._dir_name)
+
+        G.layout(prog='dot')
+        G.draw(os.path.join(self._dir_name, '{0}.png'.format(name)))